@@ -8,9 +8,347 @@ and converting them to audio formats suitable for music transcription.
 
 import os
 import sys
+import json
+import logging
+import struct
+import shutil
+import hashlib
+import time
+import threading
+import subprocess
 from pathlib import Path
-from moviepy.video.io.VideoFileClip import VideoFileClip
-from moviepy.audio.io.AudioFileClip import AudioFileClip
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
+
+from user_cache import CACHE_ROOT
+
+
+log = logging.getLogger(__name__)
+
+# ffmpeg audio codec used for each supported output format
+FFMPEG_AUDIO_CODECS = {
+    'wav': 'pcm_s16le',
+    'flac': 'flac',
+    'mp3': 'libmp3lame',
+}
+
+# Frames per block when streaming a conversion through libsndfile
+CONVERT_BLOCK_FRAMES = 65536
+
+# Integer block dtype for PCM subtypes, so PCM -> PCM conversions skip float dequantization
+PCM_BLOCK_DTYPES = {
+    'PCM_16': 'int16',
+    'PCM_24': 'int32',
+    'PCM_32': 'int32',
+}
+
+# numpy dtypes for WAV sample encodings that can be memory-mapped directly
+WAV_MEMMAP_DTYPES = {
+    'PCM_16': '<i2',
+    'FLOAT': '<f4',
+}
+
+# On-disk cache of audio tracks already extracted from videos
+AUDIO_CACHE_DIR = CACHE_ROOT
+
+# Size limit of the audio cache; least recently used entries are evicted beyond it
+AUDIO_CACHE_MAX_BYTES = int(os.environ.get("MSG_AUDIO_CACHE_MAX_MB", "2048")) * 1024 * 1024
+
+# numba-compiled versions of the sample loops below, built on first use
+_JIT_FUNCTIONS = {}
+
+
+def _run_ffmpeg(args):
+    """
+    Run ffmpeg with the given arguments, raising on failure
+    
+    Args:
+        args (list): ffmpeg arguments (without the executable name)
+        
+    Returns:
+        subprocess.CompletedProcess: The finished ffmpeg process
+    """
+    if shutil.which('ffmpeg') is None:
+        raise FileNotFoundError("ffmpeg not found. Please install ffmpeg and make sure it is on PATH.")
+    
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y'] + list(args)
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    
+    if result.returncode != 0:
+        stderr = result.stderr.strip()
+        if 'matches no streams' in stderr:
+            raise ValueError("Video file contains no audio track")
+        raise Exception(f"ffmpeg failed (code {result.returncode}): {stderr}")
+    
+    return result
+
+
+def _ffprobe_audio_stream(media_path):
+    """
+    Read the first audio stream description of a media file with ffprobe
+    
+    Args:
+        media_path (str): Path to the media file
+        
+    Returns:
+        dict: Audio info with the same schema as AudioExtractor.get_audio_info
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'a:0',
+        '-show_entries', 'stream=sample_rate,channels,duration:format=duration',
+        '-of', 'json',
+        str(media_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    
+    if result.returncode != 0:
+        raise Exception(f"ffprobe failed (code {result.returncode}): {result.stderr.strip()}")
+    
+    probe = json.loads(result.stdout or '{}')
+    streams = probe.get('streams') or []
+    
+    if not streams:
+        return {"has_audio": False}
+    
+    stream = streams[0]
+    duration = stream.get('duration') or probe.get('format', {}).get('duration')
+    
+    return {
+        "has_audio": True,
+        "duration": float(duration) if duration is not None else 0.0,
+        "sample_rate": int(stream['sample_rate']) if 'sample_rate' in stream else 'unknown',
+        "channels": int(stream['channels']) if 'channels' in stream else 'unknown'
+    }
+
+
+def _temp_path_for(dst):
+    """
+    Get a temporary path next to dst that keeps its extension
+    
+    ffmpeg picks the output format from the extension, and being in the same
+    directory lets os.replace move the finished file into place atomically.
+    The name includes the process and thread, so concurrent extractions in
+    a thread pool never share a temporary file.
+    
+    Args:
+        dst (str): Final destination path
+        
+    Returns:
+        str: Temporary path in the same directory
+    """
+    dst = Path(dst)
+    return str(dst.with_name(f".{dst.stem}.tmp{os.getpid()}-{threading.get_ident()}{dst.suffix}"))
+
+
+def _copy_into_place(src, dst):
+    """
+    Copy src to dst through a temporary file, replacing dst atomically
+    
+    Cache entries and output files are never hard-linked together: a later
+    in-place write to the output (ffmpeg -y, soundfile) would otherwise
+    rewrite the shared inode and corrupt the cache entry.
+    
+    Args:
+        src (str): Existing file
+        dst (str): Destination path (replaced if it exists)
+    """
+    tmp_path = _temp_path_for(dst)
+    try:
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _jitted(func):
+    """
+    Get a numba-compiled version of a sample loop, compiling it on first use
+    
+    numba is optional and slow to import, so it is only loaded when a loop
+    actually runs. Without numba the plain Python function is returned.
+    
+    Args:
+        func (callable): numba-compatible function
+        
+    Returns:
+        callable: Compiled function, or func itself if numba is unavailable
+    """
+    compiled = _JIT_FUNCTIONS.get(func.__name__)
+    if compiled is None:
+        try:
+            import numba
+            compiled = numba.njit(cache=True, fastmath=True)(func)
+        except ImportError:
+            compiled = func
+        _JIT_FUNCTIONS[func.__name__] = compiled
+    return compiled
+
+
+def _trim_silence_bounds(audio, threshold):
+    """
+    Find the first and last frame whose amplitude exceeds a threshold
+    
+    Args:
+        audio (np.ndarray): Samples shaped (frames, channels)
+        threshold (float): Absolute amplitude treated as silence
+        
+    Returns:
+        tuple: (start, end) frame bounds; (0, 0) if everything is silent
+    """
+    num_frames, num_channels = audio.shape
+    
+    start = num_frames
+    for i in range(num_frames):
+        for c in range(num_channels):
+            if abs(audio[i, c]) > threshold:
+                start = i
+                break
+        if start != num_frames:
+            break
+    
+    if start == num_frames:
+        return 0, 0
+    
+    end = start + 1
+    for i in range(num_frames - 1, start - 1, -1):
+        found = False
+        for c in range(num_channels):
+            if abs(audio[i, c]) > threshold:
+                found = True
+                break
+        if found:
+            end = i + 1
+            break
+    
+    return start, end
+
+
+def _wav_data_offset(wav_path):
+    """
+    Find the byte offset of the sample data in a RIFF/WAVE file
+    
+    Args:
+        wav_path (str): Path to the WAV file
+        
+    Returns:
+        int or None: Offset of the 'data' chunk payload, or None if not found
+    """
+    with open(wav_path, 'rb') as f:
+        riff_header = f.read(12)
+        if len(riff_header) < 12 or riff_header[:4] != b'RIFF' or riff_header[8:12] != b'WAVE':
+            return None
+        
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+            if chunk_id == b'data':
+                return f.tell()
+            # Chunks are word aligned
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def _advise(path, offset=0, length=0, sequential=False):
+    """
+    Hint the kernel to prefetch part of a file into the page cache
+    
+    This is a no-op on platforms without posix_fadvise.
+    
+    Args:
+        path (str): File to prefetch
+        offset (int): Byte offset of the range to prefetch
+        length (int): Byte length of the range (0 means to the end of file)
+        sequential (bool): Also enable aggressive read-ahead for a full pass
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        if sequential:
+            os.posix_fadvise(fd, offset, length, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, offset, length, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=32)
+def _resampler(in_sr, out_sr, channels):
+    """
+    Get a reusable soxr resampler for a fixed rate conversion
+    
+    Building the resampling filter is the expensive part of soxr, so the
+    stream is kept per (in_sr, out_sr, channels) and cleared between uses.
+    The returned stream is stateful and must not be shared across threads.
+    
+    Args:
+        in_sr (int): Input sample rate
+        out_sr (int): Output sample rate
+        channels (int): Number of channels
+        
+    Returns:
+        soxr.ResampleStream: Resampler for float32 input
+    """
+    import soxr
+    return soxr.ResampleStream(in_sr, out_sr, channels, dtype='float32')
+
+
+def _segment_frames(start_time, end_time, sample_rate, total_frames):
+    """
+    Clamp a time range to an audio file and convert it to frame indices
+    
+    Args:
+        start_time (float): Start time in seconds
+        end_time (float): End time in seconds
+        sample_rate (int): Sample rate of the audio
+        total_frames (int): Number of frames in the audio
+        
+    Returns:
+        tuple: (start_frame, num_frames)
+        
+    Raises:
+        ValueError: If the clamped range is empty
+    """
+    duration = total_frames / sample_rate
+    
+    if start_time < 0:
+        start_time = 0
+    if end_time > duration:
+        end_time = duration
+    if start_time >= end_time:
+        raise ValueError(f"Invalid time range: {start_time}s - {end_time}s")
+    
+    start_frame = min(int(start_time * sample_rate), total_frames)
+    num_frames = min(int((end_time - start_time) * sample_rate), total_frames - start_frame)
+    return start_frame, num_frames
+
+
+def _extract_one(job):
+    """
+    Extract the audio of one video for a batch job
+    
+    Args:
+        job (tuple): (video_path, output_path, audio_format)
+        
+    Returns:
+        dict: Result with 'file', 'output', 'success' and optionally 'error'
+    """
+    video_path, output_path, audio_format = job
+    try:
+        result_path = AudioExtractor().extract_audio_from_video(video_path, output_path, audio_format)
+        return {'file': video_path, 'output': result_path, 'success': True}
+    except Exception as e:
+        return {'file': video_path, 'output': None, 'success': False, 'error': str(e)}
 
 
 class AudioExtractor:
@@ -18,10 +356,13 @@ class AudioExtractor:
     A class to handle audio extraction from video files
     """
     
+    SUPPORTED_VIDEO = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv'})
+    SUPPORTED_AUDIO = frozenset({'.wav', '.mp3', '.flac', '.aac'})
+    
     def __init__(self):
         """Initialize the AudioExtractor"""
-        self.supported_video_formats = ['.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv']
-        self.supported_audio_formats = ['.wav', '.mp3', '.flac', '.aac']
+        self.supported_video_formats = self.SUPPORTED_VIDEO
+        self.supported_audio_formats = self.SUPPORTED_AUDIO
     
     def is_supported_video_format(self, file_path):
         """
@@ -33,10 +374,83 @@ class AudioExtractor:
         Returns:
             bool: True if format is supported, False otherwise
         """
-        file_extension = Path(file_path).suffix.lower()
-        return file_extension in self.supported_video_formats
+        return os.path.splitext(file_path)[1].lower() in self.SUPPORTED_VIDEO
+    
+    def _cache_path(self, video_path, audio_format):
+        """
+        Get the cache location for a video's extracted audio
+        
+        The key is derived from the absolute path, modification time and size
+        of the video so the file contents never need to be hashed.
+        
+        Args:
+            video_path (str): Path to the video file
+            audio_format (str): Audio format of the cached track
+            
+        Returns:
+            Path: Path of the cache entry (which may not exist yet)
+        """
+        stat = os.stat(video_path)
+        key_source = f"{os.path.abspath(video_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+        key = hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+        return AUDIO_CACHE_DIR / f"{key}.{audio_format.lower()}"
+    
+    def clear_cache(self):
+        """
+        Remove all cached audio extractions
+        
+        Returns:
+            int: Number of cache entries removed
+        """
+        removed = 0
+        if AUDIO_CACHE_DIR.is_dir():
+            for entry in AUDIO_CACHE_DIR.iterdir():
+                if entry.is_file():
+                    entry.unlink()
+                    removed += 1
+        return removed
+    
+    def _prune_cache(self, keep=None):
+        """
+        Evict the least recently used cache entries until the cache fits AUDIO_CACHE_MAX_BYTES
+        
+        Entries are ordered by access time, which cache hits refresh
+        explicitly so the order holds on relatime/noatime mounts too.
+        
+        Args:
+            keep (Path, optional): Entry that is never evicted (the one just written)
+            
+        Returns:
+            int: Number of cache entries removed
+        """
+        entries = []
+        for entry in AUDIO_CACHE_DIR.iterdir():
+            # Skip subdirectories and in-progress temporary files
+            if entry.name.startswith('.') or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime_ns, stat.st_size, entry))
+        
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= AUDIO_CACHE_MAX_BYTES:
+                break
+            if entry == keep:
+                continue
+            try:
+                entry.unlink(missing_ok=True)
+            except OSError as e:
+                log.warning("Could not evict cached audio %s: %s", entry, e)
+                continue
+            total -= size
+            removed += 1
+        return removed
     
-    def extract_audio_from_video(self, video_path, output_path=None, audio_format='wav'):
+    def extract_audio_from_video(self, video_path, output_path=None, audio_format='wav', use_cache=True):
         """
         Extract audio from a video file
         
@@ -45,6 +459,8 @@ class AudioExtractor:
             output_path (str, optional): Path for the output audio file. 
                                        If None, uses video filename with audio extension
             audio_format (str): Output audio format ('wav', 'mp3', 'flac')
+            use_cache (bool): Reuse a previous extraction of the same, unmodified video.
+                              The cache is capped at MSG_AUDIO_CACHE_MAX_MB (2048 MB by default)
             
         Returns:
             str: Path to the extracted audio file
@@ -71,37 +487,212 @@ class AudioExtractor:
         output_dir = Path(output_path).parent
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        codec = FFMPEG_AUDIO_CODECS.get(audio_format.lower())
+        if codec is None:
+            raise ValueError(f"Unsupported audio format: {audio_format}")
+        
+        cache_path = self._cache_path(video_path, audio_format) if use_cache else None
+        if cache_path is not None and cache_path.exists():
+            _copy_into_place(str(cache_path), str(output_path))
+            try:
+                os.utime(cache_path, ns=(time.time_ns(), cache_path.stat().st_mtime_ns))
+            except OSError:
+                pass
+            log.info("✓ Using cached audio extraction: %s", output_path)
+            return output_path
+        
         try:
-            print(f"Loading video file: {video_path}")
+            log.debug("Extracting audio from video: %s", video_path)
+            log.info("Extracting audio to: %s", output_path)
             
-            # Load video file
-            video_clip = VideoFileClip(video_path)
+            # Demux the first audio stream only; video/subtitle/data streams are never decoded.
+            # ffmpeg writes a temporary file that replaces output_path only once complete.
+            tmp_path = _temp_path_for(output_path)
+            try:
+                _run_ffmpeg([
+                    '-i', str(video_path),
+                    '-vn', '-sn', '-dn',
+                    '-map', '0:a:0',
+                    '-c:a', codec,
+                    '-ar', '44100',
+                    tmp_path
+                ])
+                os.replace(tmp_path, output_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
             
-            # Check if video has audio
-            if video_clip.audio is None:
-                video_clip.close()
-                raise ValueError("Video file contains no audio track")
+            if cache_path is not None:
+                try:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    _copy_into_place(str(output_path), str(cache_path))
+                    self._prune_cache(keep=cache_path)
+                except OSError as e:
+                    log.warning("Could not cache extracted audio: %s", e)
             
-            # Extract audio
-            audio_clip = video_clip.audio
+            log.info("✓ Audio extraction completed: %s", output_path)
+            return output_path
             
-            print(f"Extracting audio to: {output_path}")
-            print(f"Audio duration: {audio_clip.duration:.2f} seconds")
-            print(f"Audio sample rate: {audio_clip.fps} Hz")
+        except Exception as e:
+            log.error("✗ Audio extraction failed: %s", e)
+            raise
+    
+    def extract_with_info(self, video_path, output_path=None, audio_format='wav'):
+        """
+        Probe a video's audio stream and extract it in one call
+        
+        The container is probed once; the result is used both to reject
+        videos without audio before ffmpeg is started and as the returned info.
+        
+        Args:
+            video_path (str): Path to the input video file
+            output_path (str, optional): Path for the output audio file
+            audio_format (str): Output audio format ('wav', 'mp3', 'flac')
             
-            # Write audio file
-            audio_clip.write_audiofile(output_path)
+        Returns:
+            tuple: (audio_info dict as returned by get_audio_info, output path)
             
-            # Clean up
-            audio_clip.close()
-            video_clip.close()
+        Raises:
+            ValueError: If the video has no audio track
+        """
+        
+        audio_info = self.get_audio_info(video_path)
+        if not audio_info["has_audio"]:
+            raise ValueError("Video file contains no audio track")
+        
+        output_path = self.extract_audio_from_video(video_path, output_path, audio_format)
+        return audio_info, output_path
+    
+    def extract_to_array(self, video_path, sr=22050, channels=1, duration=None):
+        """
+        Decode a video's audio track straight into memory
+        
+        ffmpeg writes raw float32 samples to a pipe, which are read directly
+        into a buffer sized from the stream duration, so no audio file is
+        written or read back.
+        
+        Args:
+            video_path (str): Path to the input video file
+            sr (int): Sample rate of the returned samples
+            channels (int): Number of channels of the returned samples
+            duration (float, optional): Known audio duration in seconds, used to
+                                        size the buffer. Probed when not given
             
-            print(f"✓ Audio extraction completed: {output_path}")
-            return output_path
+        Returns:
+            np.ndarray: float32 samples, shaped (frames,) for mono and
+                        (frames, channels) otherwise
             
-        except Exception as e:
-            print(f"✗ Audio extraction failed: {str(e)}")
-            raise
+        Raises:
+            ValueError: If the video has no audio track
+        """
+        import numpy as np
+        
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+        
+        if shutil.which('ffmpeg') is None:
+            raise FileNotFoundError("ffmpeg not found. Please install ffmpeg and make sure it is on PATH.")
+        
+        if duration is None:
+            duration = _ffprobe_audio_stream(video_path).get('duration', 0.0)
+        
+        # One extra second in case the container under-reports the duration
+        buffer = np.empty(int((duration + 1) * sr) * channels, dtype=np.float32)
+        
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-i', str(video_path),
+            '-vn', '-sn', '-dn', '-map', '0:a:0',
+            '-f', 'f32le', '-ac', str(channels), '-ar', str(sr),
+            '-'
+        ]
+        
+        log.info("Decoding audio from: %s", video_path)
+        
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        filled = 0  # bytes
+        with proc.stdout:
+            while True:
+                if filled == buffer.nbytes:
+                    grown = np.empty(max(2 * buffer.size, sr * channels), dtype=np.float32)
+                    grown[:buffer.size] = buffer
+                    buffer = grown
+                
+                read = proc.stdout.readinto(memoryview(buffer).cast('B')[filled:])
+                if not read:
+                    break
+                filled += read
+        
+        stderr = proc.stderr.read().decode(errors='replace').strip()
+        proc.stderr.close()
+        
+        if proc.wait() != 0:
+            if 'matches no streams' in stderr:
+                raise ValueError("Video file contains no audio track")
+            raise Exception(f"ffmpeg failed (code {proc.returncode}): {stderr}")
+        
+        audio_data = buffer[:filled // 4]
+        if channels > 1:
+            audio_data = audio_data.reshape(-1, channels)
+        
+        log.info("✓ Decoded %.2f seconds at %d Hz", len(audio_data) / sr, sr)
+        
+        return audio_data
+    
+    def extract_audio_from_videos(self, video_paths, output_dir, audio_format='wav', workers=None):
+        """
+        Extract audio from several video files concurrently
+        
+        Each extraction runs in its own ffmpeg process, so a thread pool is
+        enough to keep several of them busy at once. A file listed twice is
+        extracted once, and an input whose output name is already taken by
+        another input fails instead of overwriting that output.
+        
+        Args:
+            video_paths (list): Paths to the input video files
+            output_dir (str): Directory for the extracted audio files
+            audio_format (str): Output audio format ('wav', 'mp3', 'flac')
+            workers (int, optional): Number of concurrent extractions.
+                                     Defaults to min(32, 4 * CPU count)
+            
+        Returns:
+            list: One result dict per input, in input order
+        """
+        
+        if workers is None:
+            workers = min(32, 4 * (os.cpu_count() or 1))
+        
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # One job per output file: the first input to claim a name owns it
+        owners = {}
+        for video_path in dict.fromkeys(os.path.abspath(p) for p in video_paths):
+            owners.setdefault(str(output_dir / f"{Path(video_path).stem}.{audio_format}"), video_path)
+        
+        log.info("Extracting audio from %d videos (%d workers)...", len(owners), workers)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            extracted = dict(zip(owners.values(), executor.map(
+                _extract_one,
+                zip(owners.values(), owners.keys(), repeat(audio_format))
+            )))
+        
+        results = []
+        for video_path in video_paths:
+            result = extracted.get(os.path.abspath(video_path))
+            if result is None:
+                output_path = str(output_dir / f"{Path(video_path).stem}.{audio_format}")
+                result = {'file': video_path, 'output': None, 'success': False,
+                          'error': f"Output {output_path} is already written for {owners[output_path]}"}
+            else:
+                result = dict(result, file=video_path)
+            results.append(result)
+        
+        successful = sum(1 for r in results if r['success'])
+        log.info("✓ Batch extraction completed: %d/%d successful", successful, len(results))
+        
+        return results
     
     def get_audio_info(self, video_path):
         """
@@ -118,25 +709,41 @@ class AudioExtractor:
             raise FileNotFoundError(f"Video file not found: {video_path}")
         
         try:
-            video_clip = VideoFileClip(video_path)
-            
-            if video_clip.audio is None:
-                video_clip.close()
-                return {"has_audio": False}
-            
-            audio_info = {
-                "has_audio": True,
-                "duration": video_clip.audio.duration,
-                "sample_rate": video_clip.audio.fps,
-                "channels": video_clip.audio.nchannels if hasattr(video_clip.audio, 'nchannels') else 'unknown'
-            }
-            
-            video_clip.close()
-            return audio_info
+            return _ffprobe_audio_stream(video_path)
             
         except Exception as e:
             raise Exception(f"Failed to get audio info: {str(e)}")
     
+    def get_audio_info_batch(self, video_paths, workers=None):
+        """
+        Get audio information for several video files concurrently
+        
+        ffprobe handles one file per process, so the probes are run in
+        parallel from a thread pool rather than one after another.
+        
+        Args:
+            video_paths (list): Paths to the video files
+            workers (int, optional): Number of concurrent probes.
+                                     Defaults to min(32, 4 * CPU count)
+            
+        Returns:
+            list: One info dict per input, in input order, with the same schema
+                  as get_audio_info. Failed probes have has_audio=False and an
+                  'error' message.
+        """
+        
+        if workers is None:
+            workers = min(32, 4 * (os.cpu_count() or 1))
+        
+        def probe(video_path):
+            try:
+                return self.get_audio_info(video_path)
+            except Exception as e:
+                return {"has_audio": False, "error": str(e)}
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(probe, video_paths))
+    
     def extract_audio_segment(self, video_path, start_time, end_time, output_path=None, audio_format='wav'):
         """
         Extract a specific segment of audio from a video file
@@ -163,33 +770,30 @@ class AudioExtractor:
             video_stem = Path(video_path).stem
             output_path = f"{video_stem}_segment_{start_time}_{end_time}.{audio_format}"
         
+        codec = FFMPEG_AUDIO_CODECS.get(audio_format.lower())
+        if codec is None:
+            raise ValueError(f"Unsupported audio format: {audio_format}")
+        
         try:
-            print(f"Loading video file: {video_path}")
-            
-            # Load video file and extract segment
-            video_clip = VideoFileClip(video_path).subclip(start_time, end_time)
+            log.info("Extracting audio segment (%ss - %ss) to: %s", start_time, end_time, output_path)
             
-            if video_clip.audio is None:
-                video_clip.close()
-                raise ValueError("Video file contains no audio track")
-            
-            # Extract audio segment
-            audio_clip = video_clip.audio
-            
-            print(f"Extracting audio segment ({start_time}s - {end_time}s) to: {output_path}")
-            
-            # Write audio file
-            audio_clip.write_audiofile(output_path)
-            
-            # Clean up
-            audio_clip.close()
-            video_clip.close()
+            # -ss/-to before -i enables fast input seeking instead of decoding from the start
+            _run_ffmpeg([
+                '-ss', str(start_time),
+                '-to', str(end_time),
+                '-i', str(video_path),
+                '-vn', '-sn', '-dn',
+                '-map', '0:a:0',
+                '-c:a', codec,
+                '-ar', '44100',
+                str(output_path)
+            ])
             
-            print(f"✓ Audio segment extraction completed: {output_path}")
+            log.info("✓ Audio segment extraction completed: %s", output_path)
             return output_path
             
         except Exception as e:
-            print(f"✗ Audio segment extraction failed: {str(e)}")
+            log.error("✗ Audio segment extraction failed: %s", e)
             raise
 
 
@@ -208,19 +812,23 @@ class AudioExtractor:
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
         try:
-            import librosa
-            
-            print(f"Analyzing audio file: {audio_path}")
+            import soundfile as sf
             
-            # Load audio to get basic info
-            audio_data, sample_rate = librosa.load(audio_path, sr=None)
-            duration = len(audio_data) / sample_rate
+            log.debug("Analyzing audio file: %s", audio_path)
             
-            # Determine number of channels
-            if len(audio_data.shape) == 1:
-                channels = 1  # Mono
-            else:
-                channels = audio_data.shape[1]  # Stereo or multi-channel
+            # Read the container header only instead of decoding the samples
+            try:
+                header = sf.info(audio_path)
+                duration = header.duration
+                sample_rate = header.samplerate
+                channels = header.channels
+            except Exception:
+                # libsndfile cannot parse this container (e.g. AAC, older MP3 support)
+                import librosa
+                
+                duration = librosa.get_duration(path=audio_path)
+                sample_rate = librosa.get_samplerate(audio_path)
+                channels = 'unknown'
             
             info = {
                 "has_audio": True,
@@ -231,12 +839,11 @@ class AudioExtractor:
                 "file_size": os.path.getsize(audio_path)
             }
             
-            print(f"Audio file analysis completed:")
-            print(f"  - Duration: {duration:.2f} seconds")
-            print(f"  - Sample rate: {sample_rate} Hz")
-            print(f"  - Channels: {channels}")
-            print(f"  - Format: {info['format'].upper()}")
-            print(f"  - File size: {info['file_size'] / (1024*1024):.2f} MB")
+            log.info("Audio file analysis completed:\n  - Duration: %.2f seconds\n"
+                     "  - Sample rate: %s Hz\n  - Channels: %s\n  - Format: %s\n"
+                     "  - File size: %.2f MB",
+                     duration, sample_rate, channels, info['format'].upper(),
+                     info['file_size'] / (1024*1024))
             
             return info
             
@@ -260,52 +867,73 @@ class AudioExtractor:
             raise FileNotFoundError(f"Input audio file not found: {input_path}")
         
         try:
-            import librosa
-            import soundfile as sf
+            log.debug("Converting audio format...\n  - Input: %s\n  - Output: %s\n"
+                      "  - Target format: %s",
+                      input_path, output_path, target_format.upper())
             
-            print(f"Converting audio format...")
-            print(f"  - Input: {input_path}")
-            print(f"  - Output: {output_path}")
-            print(f"  - Target format: {target_format.upper()}")
-            
-            # Load audio data
-            audio_data, sample_rate = librosa.load(input_path, sr=None)
+            target = target_format.lower()
+            if target not in FFMPEG_AUDIO_CODECS:
+                raise ValueError(f"Unsupported target format: {target_format}")
             
             # Ensure output directory exists
             output_dir = Path(output_path).parent
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Save in target format
-            if target_format.lower() == 'wav':
-                sf.write(output_path, audio_data, sample_rate, format='WAV')
-            elif target_format.lower() == 'flac':
-                sf.write(output_path, audio_data, sample_rate, format='FLAC')
-            elif target_format.lower() == 'mp3':
-                # For MP3, we need to use a different approach
-                # soundfile doesn't support MP3 writing, so we'll use moviepy
-                from moviepy.audio.io.AudioFileClip import AudioFileClip
+            if target == 'mp3':
+                # soundfile can't write MP3; encode with libmp3lame in a single ffmpeg pass
+                # without decoding into Python or writing a temporary WAV
+                _run_ffmpeg([
+                    '-i', str(input_path),
+                    '-codec:a', 'libmp3lame',
+                    '-q:a', '2',
+                    str(output_path)
+                ])
+            else:
+                import soundfile as sf
                 
-                # Create a temporary WAV file first
-                temp_wav = output_path.replace('.mp3', '_temp.wav')
-                sf.write(temp_wav, audio_data, sample_rate, format='WAV')
+                # The whole input is read front to back
+                _advise(input_path, sequential=True)
                 
-                # Convert to MP3 using moviepy
-                audio_clip = AudioFileClip(temp_wav)
-                audio_clip.write_audiofile(output_path, verbose=False, logger=None)
-                audio_clip.close()
+                try:
+                    in_file = sf.SoundFile(input_path)
+                except RuntimeError:
+                    # Input container not readable by libsndfile (e.g. AAC); let ffmpeg transcode it
+                    in_file = None
                 
-                # Clean up temporary file
-                os.remove(temp_wav)
-            else:
-                raise ValueError(f"Unsupported target format: {target_format}")
+                if in_file is None:
+                    _run_ffmpeg([
+                        '-i', str(input_path),
+                        '-c:a', FFMPEG_AUDIO_CODECS[target],
+                        str(output_path)
+                    ])
+                else:
+                    # Keep integer PCM as integers when the target can store the same subtype
+                    out_format = target.upper()
+                    block_dtype = 'float32'
+                    out_subtype = None
+                    if in_file.subtype in PCM_BLOCK_DTYPES and sf.check_format(out_format, in_file.subtype):
+                        block_dtype = PCM_BLOCK_DTYPES[in_file.subtype]
+                        out_subtype = in_file.subtype
+                    
+                    # Stream fixed-size blocks so memory use doesn't grow with duration
+                    with in_file, sf.SoundFile(
+                        output_path, mode='w',
+                        samplerate=in_file.samplerate,
+                        channels=in_file.channels,
+                        format=out_format,
+                        subtype=out_subtype
+                    ) as out_file:
+                        for block in in_file.blocks(blocksize=CONVERT_BLOCK_FRAMES, dtype=block_dtype):
+                            out_file.write(block)
             
-            print(f"✓ Audio format conversion completed: {output_path}")
+            log.info("✓ Audio format conversion completed: %s", output_path)
             return output_path
             
         except Exception as e:
             raise Exception(f"Audio format conversion failed: {str(e)}")
     
-    def extract_audio_segment_from_audio(self, audio_path, start_time, end_time, output_path):
+    def extract_audio_segment_from_audio(self, audio_path, start_time, end_time, output_path,
+                                         trim=False, trim_threshold=0.01):
         """
         Extract a segment from an audio file
         
@@ -314,6 +942,8 @@ class AudioExtractor:
             start_time (float): Start time in seconds
             end_time (float): End time in seconds
             output_path (str): Path for the output audio segment
+            trim (bool): Strip leading and trailing silence from the segment
+            trim_threshold (float): Absolute amplitude treated as silence when trimming
             
         Returns:
             str: Path to the extracted audio segment
@@ -323,32 +953,71 @@ class AudioExtractor:
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
         try:
-            import librosa
             import soundfile as sf
             
-            print(f"Extracting audio segment from audio file...")
-            print(f"  - Input: {audio_path}")
-            print(f"  - Segment: {start_time}s - {end_time}s")
-            print(f"  - Output: {output_path}")
+            log.debug("Extracting audio segment from audio file...\n  - Input: %s\n"
+                      "  - Segment: %ss - %ss\n  - Output: %s",
+                      audio_path, start_time, end_time, output_path)
             
-            # Load the full audio file
-            audio_data, sample_rate = librosa.load(audio_path, sr=None)
-            duration = len(audio_data) / sample_rate
+            try:
+                # Read the header only; the sample data is read for the segment alone below
+                info = sf.info(audio_path)
+            except RuntimeError:
+                # libsndfile cannot open this format (e.g. .aac)
+                info = None
             
-            # Validate time range
-            if start_time < 0:
-                start_time = 0
-            if end_time > duration:
-                end_time = duration
-            if start_time >= end_time:
-                raise ValueError(f"Invalid time range: {start_time}s - {end_time}s")
-            
-            # Calculate sample indices
-            start_sample = int(start_time * sample_rate)
-            end_sample = int(end_time * sample_rate)
+            if info is None:
+                import librosa
+                
+                # Decode the whole file as before, keeping its channels (frames, channels)
+                audio_data, sample_rate = librosa.load(audio_path, sr=None, mono=False)
+                audio_data = audio_data.T
+                start_sample, num_frames = _segment_frames(start_time, end_time, sample_rate, len(audio_data))
+                segment_data = audio_data[start_sample:start_sample + num_frames]
+            else:
+                sample_rate = info.samplerate
+                
+                # Validate time range and calculate sample indices
+                start_sample, num_frames = _segment_frames(start_time, end_time, sample_rate, info.frames)
+                
+                data_offset = None
+                if info.format == 'WAV' and info.subtype in WAV_MEMMAP_DTYPES:
+                    data_offset = _wav_data_offset(audio_path)
+                
+                if data_offset is not None:
+                    import numpy as np
+                
+                    # Prefetch just the segment's bytes before the pages are touched
+                    frame_bytes = np.dtype(WAV_MEMMAP_DTYPES[info.subtype]).itemsize * info.channels
+                    _advise(audio_path, data_offset + start_sample * frame_bytes, num_frames * frame_bytes)
+                
+                    # Map the PCM data and slice a view; only the segment's pages are read
+                    samples = np.memmap(
+                        audio_path,
+                        dtype=WAV_MEMMAP_DTYPES[info.subtype],
+                        mode='r',
+                        offset=data_offset,
+                        shape=(info.frames, info.channels)
+                    )
+                    segment_data = samples[start_sample:start_sample + num_frames]
+                    if info.channels == 1:
+                        segment_data = segment_data[:, 0]
+                else:
+                    # Seek to the segment and read only its frames
+                    segment_data, sample_rate = sf.read(
+                        audio_path,
+                        start=start_sample,
+                        frames=num_frames,
+                        dtype='float32',
+                        always_2d=False
+                    )
             
-            # Extract segment
-            segment_data = audio_data[start_sample:end_sample]
+            if trim:
+                # Integer PCM samples are unscaled, so scale the threshold to match
+                threshold = trim_threshold * 32768 if segment_data.dtype.kind == 'i' else trim_threshold
+                frames_2d = segment_data.reshape(len(segment_data), -1)
+                trim_start, trim_end = _jitted(_trim_silence_bounds)(frames_2d, threshold)
+                segment_data = segment_data[trim_start:trim_end]
             
             # Ensure output directory exists
             output_dir = Path(output_path).parent
@@ -357,25 +1026,172 @@ class AudioExtractor:
             # Save segment
             sf.write(output_path, segment_data, sample_rate)
             
-            segment_duration = len(segment_data) / sample_rate
-            print(f"✓ Audio segment extracted successfully")
-            print(f"  - Segment duration: {segment_duration:.2f} seconds")
-            print(f"  - Output file: {output_path}")
+            log.info("✓ Audio segment extracted successfully\n"
+                     "  - Segment duration: %.2f seconds\n  - Output file: %s",
+                     len(segment_data) / sample_rate, output_path)
             
             return output_path
             
         except Exception as e:
             raise Exception(f"Audio segment extraction failed: {str(e)}")
 
+    
+    def extract_many_segments(self, audio_path, segments):
+        """
+        Extract several segments from one audio file
+        
+        The input is opened and its header parsed once; each segment is then
+        a seek plus a read of just its frames on the same file handle.
+        
+        Args:
+            audio_path (str): Path to the input audio file
+            segments (list): (start_time, end_time, output_path) tuples
+            
+        Returns:
+            list: Paths to the extracted audio segments, in input order
+        """
+        
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        
+        try:
+            import soundfile as sf
+            
+            log.info("Extracting %d segments from: %s", len(segments), audio_path)
+            
+            output_paths = []
+            with sf.SoundFile(audio_path) as audio_file:
+                sample_rate = audio_file.samplerate
+                
+                for start_time, end_time, output_path in segments:
+                    start_frame, num_frames = _segment_frames(
+                        start_time, end_time, sample_rate, audio_file.frames
+                    )
+                    
+                    audio_file.seek(start_frame)
+                    segment_data = audio_file.read(num_frames, dtype='float32')
+                    
+                    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                    sf.write(output_path, segment_data, sample_rate)
+                    output_paths.append(output_path)
+            
+            log.info("✓ Extracted %d segments", len(output_paths))
+            return output_paths
+            
+        except Exception as e:
+            raise Exception(f"Audio segment extraction failed: {str(e)}")
+
+    
+    def extract_audio_segment_resampled(self, audio_path, start_time, end_time, target_sr, output_path):
+        """
+        Extract a segment from an audio file and resample it to a fixed rate
+        
+        Args:
+            audio_path (str): Path to the input audio file
+            start_time (float): Start time in seconds
+            end_time (float): End time in seconds
+            target_sr (int): Sample rate of the output segment
+            output_path (str): Path for the output audio segment
+            
+        Returns:
+            str: Path to the extracted audio segment
+        """
+        
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        
+        try:
+            import soundfile as sf
+            
+            with sf.SoundFile(audio_path) as audio_file:
+                sample_rate = audio_file.samplerate
+                channels = audio_file.channels
+                start_frame, num_frames = _segment_frames(
+                    start_time, end_time, sample_rate, audio_file.frames
+                )
+                audio_file.seek(start_frame)
+                segment_data = audio_file.read(num_frames, dtype='float32', always_2d=True)
+            
+            if sample_rate != target_sr:
+                try:
+                    resampler = _resampler(sample_rate, target_sr, channels)
+                    resampler.clear()
+                    segment_data = resampler.resample_chunk(segment_data, last=True)
+                except ImportError:
+                    import librosa
+                    segment_data = librosa.resample(segment_data.T, orig_sr=sample_rate, target_sr=target_sr).T
+            
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            sf.write(output_path, segment_data, target_sr)
+            
+            log.info("✓ Audio segment extracted at %d Hz: %s", target_sr, output_path)
+            return output_path
+            
+        except Exception as e:
+            raise Exception(f"Audio segment extraction failed: {str(e)}")
+    
+    def concat_segments(self, audio_path, segments, output_path):
+        """
+        Join several segments of one audio file into a single output file
+        
+        The output buffer is allocated once at its final size and each
+        segment is read straight into its slice, so no intermediate list of
+        arrays or concatenation copy is needed.
+        
+        Args:
+            audio_path (str): Path to the input audio file
+            segments (list): (start_time, end_time) tuples in output order
+            output_path (str): Path for the joined audio file
+            
+        Returns:
+            str: Path to the joined audio file
+        """
+        
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        
+        try:
+            import numpy as np
+            import soundfile as sf
+            
+            log.info("Joining %d segments from: %s", len(segments), audio_path)
+            
+            with sf.SoundFile(audio_path) as audio_file:
+                sample_rate = audio_file.samplerate
+                ranges = [
+                    _segment_frames(start_time, end_time, sample_rate, audio_file.frames)
+                    for start_time, end_time in segments
+                ]
+                
+                output = np.empty((sum(n for _, n in ranges), audio_file.channels), dtype='float32')
+                
+                offset = 0
+                for start_frame, num_frames in ranges:
+                    audio_file.seek(start_frame)
+                    audio_file.read(num_frames, dtype='float32', always_2d=True,
+                                    out=output[offset:offset + num_frames])
+                    offset += num_frames
+            
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            sf.write(output_path, output, sample_rate)
+            
+            log.info("✓ Joined audio written to: %s (%.2f seconds)", output_path, len(output) / sample_rate)
+            return output_path
+            
+        except Exception as e:
+            raise Exception(f"Audio segment concatenation failed: {str(e)}")
+
 
 def main():
     """
     Command-line interface for the audio extractor
     """
-    if len(sys.argv) < 2:
+    if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help'):
         print("Usage: python3 audio_extractor.py <video_file> [output_file] [format]")
         print("Example: python3 audio_extractor.py video.mp4 audio.wav wav")
-        sys.exit(1)
+        sys.exit(0 if len(sys.argv) >= 2 else 1)
+    
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     
     video_file = sys.argv[1]
     output_file = sys.argv[2] if len(sys.argv) > 2 else None
@@ -384,26 +1200,17 @@ def main():
     extractor = AudioExtractor()
     
     try:
-        # Get audio info first
-        print("Getting audio information...")
-        audio_info = extractor.get_audio_info(video_file)
-        
-        if not audio_info["has_audio"]:
-            print("✗ Video file contains no audio track")
-            sys.exit(1)
-        
-        print(f"Audio duration: {audio_info['duration']:.2f} seconds")
-        print(f"Sample rate: {audio_info['sample_rate']} Hz")
-        print(f"Channels: {audio_info['channels']}")
-        print()
-        
-        # Extract audio
-        output_path = extractor.extract_audio_from_video(
+        # Probe once, then extract
+        audio_info, output_path = extractor.extract_with_info(
             video_file, 
             output_file, 
             audio_format
         )
         
+        print(f"Audio duration: {audio_info['duration']:.2f} seconds")
+        print(f"Sample rate: {audio_info['sample_rate']} Hz")
+        print(f"Channels: {audio_info['channels']}")
+        
         print(f"\n✓ Success! Audio extracted to: {output_path}")
         
     except Exception as e:
@@ -7,19 +7,27 @@ to convert MusicXML files to traditional visual music sheets.
 """
 
 from musicxml_to_pdf_parser import MusicXMLToPDFParser
+from functools import lru_cache
+import copy
 import os
 
 
-def demo_basic_conversion():
+TEST_FILE = "test_complete.musicxml"
+
+
+@lru_cache(maxsize=None)
+def demo_file_exists(path=TEST_FILE):
+    """Check (once per path) whether a demo input file exists"""
+    return os.path.exists(path)
+
+
+def demo_basic_conversion(parser):
     """Demonstrate basic MusicXML to PDF conversion"""
     print("=== MusicXML to PDF Parser Demo ===\n")
     
-    # Initialize the parser
-    parser = MusicXMLToPDFParser()
-    
     # Check if we have a test file
-    test_file = "test_complete.musicxml"
-    if not os.path.exists(test_file):
+    test_file = TEST_FILE
+    if not demo_file_exists(test_file):
         print(f"Test file {test_file} not found. Please run the parser first to create it.")
         return
     
@@ -58,36 +66,36 @@ def demo_basic_conversion():
         print(f"   - {key}: {value}")
 
 
-def demo_custom_settings():
+def demo_custom_settings(parser):
     """Demonstrate parser with custom settings"""
     print("\n=== Custom Settings Demo ===\n")
     
-    parser = MusicXMLToPDFParser()
-    
-    # Modify PDF settings
+    # Modify PDF settings (restored afterwards since the parser is shared)
+    default_settings = copy.deepcopy(parser.pdf_settings)
     parser.pdf_settings['margins']['top'] = 30
     parser.pdf_settings['margins']['bottom'] = 30
     parser.pdf_settings['title_font_size'] = 18
     
-    test_file = "test_complete.musicxml"
-    if os.path.exists(test_file):
-        try:
-            output_path = parser.parse_musicxml_to_pdf(
-                xml_path=test_file,
-                output_path="demo_custom.pdf",
-                title="Custom Settings Demo"
-            )
-            print(f"✓ Generated with custom settings: {output_path}")
-        except Exception as e:
-            print(f"✗ Error: {e}")
-
-
-def demo_error_handling():
+    test_file = TEST_FILE
+    try:
+        if demo_file_exists(test_file):
+            try:
+                output_path = parser.parse_musicxml_to_pdf(
+                    xml_path=test_file,
+                    output_path="demo_custom.pdf",
+                    title="Custom Settings Demo"
+                )
+                print(f"✓ Generated with custom settings: {output_path}")
+            except Exception as e:
+                print(f"✗ Error: {e}")
+    finally:
+        parser.pdf_settings = default_settings
+
+
+def demo_error_handling(parser):
     """Demonstrate error handling"""
     print("\n=== Error Handling Demo ===\n")
     
-    parser = MusicXMLToPDFParser()
-    
     # Test with non-existent file
     print("1. Testing with non-existent file:")
     try:
@@ -142,9 +150,12 @@ def show_usage_examples():
 
 def main():
     """Run all demos"""
-    demo_basic_conversion()
-    demo_custom_settings()
-    demo_error_handling()
+    # One parser for all demos so backend detection runs only once
+    parser = MusicXMLToPDFParser()
+    
+    demo_basic_conversion(parser)
+    demo_custom_settings(parser)
+    demo_error_handling(parser)
     show_usage_examples()
     
     print("\n=== Demo Complete ===")
@@ -6,30 +6,350 @@ This file contains various examples showing how to use the different
 modules and the main application programmatically.
 """
 
+import io
 import os
+import json
+import logging
+import pickle
+import subprocess
+import tempfile
+import multiprocessing
 from pathlib import Path
+from typing import Optional
+from itertools import repeat
+from functools import lru_cache
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 
-# Import our modules
-from audio_extractor import AudioExtractor
-from music_transcriber import MusicTranscriber
-from sheet_music_generator import SheetMusicGenerator
-from mp4_to_sheet_music import MP4ToSheetMusicConverter
 
+# librosa's numba kernels are compiled on first use; keep the compiled
+# code next to the examples so later runs load it from disk.
+os.environ.setdefault('NUMBA_CACHE_DIR', str(Path(__file__).resolve().parent / '.numba_cache'))
 
-def example_1_basic_conversion():
+
+# Our modules pull in librosa, basic-pitch and music21, so they are imported
+# on first use and each object is created once per process.
+
+@lru_cache(maxsize=1)
+def _get_extractor():
+    """Get the shared AudioExtractor"""
+    from audio_extractor import AudioExtractor
+    return AudioExtractor()
+
+
+def _get_transcriber():
+    """Get the shared MusicTranscriber (the converter's, so one model per process)"""
+    from mp4_to_sheet_music import _get_transcriber as get_shared_transcriber
+    return get_shared_transcriber()
+
+
+@lru_cache(maxsize=1)
+def _get_generator():
+    """Get the shared SheetMusicGenerator"""
+    from sheet_music_generator import SheetMusicGenerator
+    return SheetMusicGenerator()
+
+
+@lru_cache(maxsize=1)
+def _get_converter():
+    """Get the shared MP4ToSheetMusicConverter"""
+    from mp4_to_sheet_music import MP4ToSheetMusicConverter
+    return MP4ToSheetMusicConverter()
+
+
+# Output directories written by the examples. main() creates them up front,
+# so examples running concurrently never race to create the same directory.
+OUTPUT_DIRS = [
+    "example1_output",
+    "example2_output",
+    "batch_output",
+    "example7_output/beginning",
+    "example7_output/middle",
+    "example7_output/end"
+]
+
+NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+
+
+@dataclass
+class Fixtures:
+    """
+    Input files shared by the examples, checked once in main()
+    
+    A field is None when its file does not exist.
+    """
+    video: Optional[Path]
+    wav: Optional[Path]
+    midi: Optional[Path]
+    
+    @classmethod
+    def discover(cls, video="test_video.mp4", wav="test_video.wav", midi="test_video.mid"):
+        """
+        Look up the fixture files, reporting any that are missing
+        
+        Args:
+            video (str): Path of the test video
+            wav (str): Path of the test audio file
+            midi (str): Path of the test MIDI file
+            
+        Returns:
+            Fixtures: The fixtures that were found
+        """
+        found = []
+        for path in (Path(video), Path(wav), Path(midi)):
+            if path.exists():
+                found.append(path)
+            else:
+                print(f"Fixture not found: {path} (examples using it are skipped)")
+                found.append(None)
+        
+        return cls(*found)
+
+
+def _midi_info(midi_path):
+    """
+    Get MIDI file information, parsing with symusic when it is installed
+    
+    symusic parses MIDI in C++, which is much faster than pretty_midi's
+    pure-Python event loop. The returned dict has the same shape as
+    MusicTranscriber.get_midi_info; without symusic that method is used.
+    With symusic, 'initial_tempo' is the first tempo of the tempo map
+    rather than pretty_midi's onset-based estimate.
+    
+    Args:
+        midi_path (str): Path to the MIDI file
+        
+    Returns:
+        dict: MIDI file information
+    """
+    try:
+        import symusic
+    except ImportError:
+        return _get_transcriber().get_midi_info(midi_path)
+    
+    score = symusic.Score(midi_path, ttype='second')
+    
+    info = {
+        'duration': float(score.end()),
+        'num_instruments': len(score.tracks),
+        'total_notes': sum(len(track.notes) for track in score.tracks),
+        'initial_tempo': float(score.tempos[0].qpm) if len(score.tempos) > 0 else 120.0,
+        'instruments': []
+    }
+    
+    for i, track in enumerate(score.tracks):
+        if len(track.notes) > 0:
+            pitches = track.notes.numpy()['pitch']
+            low, high = int(pitches.min()), int(pitches.max())
+            info['instruments'].append({
+                'index': i,
+                'name': track.name,
+                'program': track.program,
+                'is_drum': track.is_drum,
+                'num_notes': len(track.notes),
+                'pitch_range': [low, high],
+                'note_range': [f"{NOTE_NAMES[low % 12]}{low // 12 - 1}",
+                               f"{NOTE_NAMES[high % 12]}{high // 12 - 1}"]
+            })
+    
+    return info
+
+
+def _midi_summaries(midi_paths):
+    """
+    Get the note count and duration of several MIDI files in one pass
+    
+    Only the two numbers are computed, skipping the per-instrument details
+    of _midi_info.
+    
+    Args:
+        midi_paths (list): Paths to the MIDI files
+        
+    Returns:
+        list: (total_notes, duration in seconds) per file
+    """
+    try:
+        import symusic
+    except ImportError:
+        infos = [_get_transcriber().get_midi_info(p) for p in midi_paths]
+        return [(info['total_notes'], info['duration']) for info in infos]
+    
+    scores = [symusic.Score(p, ttype='second') for p in midi_paths]
+    return [
+        (sum(len(track.notes) for track in score.tracks), float(score.end()))
+        for score in scores
+    ]
+
+
+def _sidecar_cached(source_path, suffix, compute):
+    """
+    Compute a result derived from a file, reusing a pickled copy from a previous run
+    
+    The result is stored next to the source as <source><suffix> together
+    with the source's modification time and size; it is recomputed whenever
+    either changes.
+    
+    Args:
+        source_path (str): File the result is derived from
+        suffix (str): Suffix of the sidecar file (e.g. '.features.pkl')
+        compute (callable): Zero-argument function producing the result
+        
+    Returns:
+        The cached or freshly computed result
+    """
+    stat = os.stat(source_path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cache_path = f"{source_path}{suffix}"
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, result = pickle.load(f)
+        if cached_key == key:
+            return result
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+    
+    result = compute()
+    
+    try:
+        with open(cache_path, 'wb') as f:
+            pickle.dump((key, result), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"Warning: Could not cache results in {cache_path}: {e}")
+    
+    return result
+
+
+def _fast_load_wav(path):
+    """
+    Load a WAV file with soundfile instead of librosa's loader
+    
+    The example intermediates are WAV files, which libsndfile reads
+    directly at their native rate without audioread or resampling.
+    
+    Args:
+        path (str): Path to the WAV file
+        
+    Returns:
+        tuple: (audio_data as float32 array, sample_rate)
+    """
+    import soundfile as sf
+    return sf.read(path, dtype='float32', always_2d=False)
+
+
+def _cached_features(audio_path):
+    """
+    Analyze audio features, reusing the result of a previous run
+    
+    Args:
+        audio_path (str): Path to the audio file
+        
+    Returns:
+        dict: Audio analysis results (see MusicTranscriber.analyze_audio_features)
+    """
+    def analyze():
+        if audio_path.lower().endswith('.wav'):
+            return _get_transcriber().analyze_audio_features_array(*_fast_load_wav(audio_path))
+        return _get_transcriber().analyze_audio_features(audio_path)
+    
+    return _sidecar_cached(audio_path, '.features.pkl', analyze)
+
+
+def _load_midi_cached(midi_file):
+    """
+    Analyze a MIDI file's events and notation, reusing the result of a previous run
+    
+    Only the two analysis dicts are cached, not the parsed music21 score,
+    so a re-run needs no MIDI parsing at all.
+    
+    Args:
+        midi_file (str): Path to the MIDI file
+        
+    Returns:
+        tuple: (MIDI info dict, musical analysis dict)
+    """
+    def analyze():
+        midi_info = _midi_info(midi_file)
+        
+        print(f"Loading as music21 score...")
+        generator = _get_generator()
+        score = generator.load_midi_to_music21(midi_file)
+        return midi_info, generator.analyze_musical_content(score)
+    
+    return _sidecar_cached(midi_file, '.cache.pkl', analyze)
+
+
+def _is_done(manifest_path, input_path):
+    """
+    Check whether an example already ran on the current version of its input
+    
+    Args:
+        manifest_path (str): Manifest written by _mark_done, in the
+                             example's output directory
+        input_path (str): Input file of the example
+        
+    Returns:
+        bool: True if the manifest matches the input and all outputs still exist
+    """
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        stat = os.stat(input_path)
+    except (OSError, ValueError):
+        return False
+    
+    return (manifest.get('input_mtime_ns') == stat.st_mtime_ns
+            and manifest.get('input_size') == stat.st_size
+            and all(os.path.exists(p) for p in manifest.get('outputs', [])))
+
+
+def _mark_done(manifest_path, input_path, outputs):
+    """
+    Record that an example completed, so the next run can skip it
+    
+    Args:
+        manifest_path (str): Path of the manifest file
+        input_path (str): Input file of the example
+        outputs (list): Files the example produced
+    """
+    stat = os.stat(input_path)
+    manifest = {
+        'input_mtime_ns': stat.st_mtime_ns,
+        'input_size': stat.st_size,
+        'outputs': [str(p) for p in outputs]
+    }
+    
+    try:
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+    except OSError as e:
+        print(f"Warning: Could not write {manifest_path}: {e}")
+
+
+def example_1_basic_conversion(fx):
     """
     Example 1: Basic conversion using the main converter class
+    
+    Args:
+        fx (Fixtures): Shared input files
     """
     print("Example 1: Basic MP4 to Sheet Music Conversion")
     print("=" * 50)
     
+    if fx.video is None:
+        return
+    
     # Create converter instance
-    converter = MP4ToSheetMusicConverter()
+    converter = _get_converter()
     
     # Convert a video file (replace with your actual file)
-    video_file = "test_video.mp4"
+    video_file = str(fx.video)
     
-    if os.path.exists(video_file):
+    manifest = "example1_output/.done"
+    
+    if _is_done(manifest, video_file):
+        print("(cached)")
+    else:
         result = converter.convert_mp4_to_sheet_music(
             video_path=video_file,
             output_dir="example1_output",
@@ -40,47 +360,54 @@ def example_1_basic_conversion():
         if result['success']:
             print(f"✓ Conversion successful!")
             print(f"Sheet music: {result['sheet_music']}")
+            _mark_done(manifest, video_file, [result['sheet_music'], result['simple_sheet_music']])
         else:
             print(f"✗ Conversion failed: {result.get('error')}")
-    else:
-        print(f"Video file not found: {video_file}")
 
 
-def example_2_step_by_step():
+def example_2_step_by_step(fx):
     """
     Example 2: Step-by-step conversion using individual modules
+    
+    Args:
+        fx (Fixtures): Shared input files
     """
     print("\nExample 2: Step-by-Step Conversion")
     print("=" * 50)
     
-    video_file = "test_video.mp4"
+    if fx.video is None:
+        return
+    
+    video_file = str(fx.video)
     
-    if not os.path.exists(video_file):
-        print(f"Video file not found: {video_file}")
+    output_dir = Path("example2_output")
+    manifest = str(output_dir / ".done")
+    if _is_done(manifest, video_file):
+        print("(cached)")
         return
     
     try:
         # Step 1: Extract audio
         print("Step 1: Extracting audio...")
-        extractor = AudioExtractor()
+        extractor = _get_extractor()
         audio_path = extractor.extract_audio_from_video(
             video_file, 
-            "example2_audio.wav"
+            str(output_dir / "example2_audio.wav")
         )
         print(f"✓ Audio extracted: {audio_path}")
         
         # Step 2: Transcribe to MIDI
         print("\nStep 2: Transcribing to MIDI...")
-        transcriber = MusicTranscriber()
+        transcriber = _get_transcriber()
         
         # Analyze audio first
-        features = transcriber.analyze_audio_features(audio_path)
+        features = _cached_features(audio_path)
         print(f"Tempo: {features['tempo']:.1f} BPM")
         
         # Transcribe
         midi_path = transcriber.transcribe_audio_to_midi(
             audio_path, 
-            "example2_music.mid",
+            str(output_dir / "example2_music.mid"),
             onset_threshold=0.4,
             frame_threshold=0.2
         )
@@ -88,11 +415,11 @@ def example_2_step_by_step():
         
         # Step 3: Generate sheet music
         print("\nStep 3: Generating sheet music...")
-        generator = SheetMusicGenerator()
+        generator = _get_generator()
         
         sheet_path = generator.generate_sheet_music(
             midi_path,
-            "example2_sheet.musicxml",
+            str(output_dir / "example2_sheet.musicxml"),
             title="Step-by-Step Example"
         )
         print(f"✓ Sheet music created: {sheet_path}")
@@ -100,76 +427,81 @@ def example_2_step_by_step():
         # Also create simplified version
         simple_path = generator.create_simple_notation(
             midi_path,
-            "example2_simple.musicxml"
+            str(output_dir / "example2_simple.musicxml")
         )
         print(f"✓ Simple notation: {simple_path}")
         
+        _mark_done(manifest, video_file, [audio_path, midi_path, sheet_path, simple_path])
+        
     except Exception as e:
         print(f"✗ Error: {str(e)}")
 
 
-def example_3_audio_analysis():
+def example_3_audio_analysis(fx):
     """
     Example 3: Detailed audio analysis
+    
+    Args:
+        fx (Fixtures): Shared input files
     """
     print("\nExample 3: Audio Analysis")
     print("=" * 50)
     
-    audio_file = "test_video.wav"
-    
-    if not os.path.exists(audio_file):
-        print(f"Audio file not found: {audio_file}")
-        print("Run example 1 or 2 first to create an audio file")
+    if fx.wav is None:
         return
     
+    audio_file = str(fx.wav)
+    
     try:
-        transcriber = MusicTranscriber()
-        
         # Perform detailed analysis
         print("Analyzing audio features...")
-        features = transcriber.analyze_audio_features(audio_file)
-        
-        print(f"\nAudio Analysis Results:")
-        print(f"  - Tempo: {features['tempo']:.1f} BPM")
-        print(f"  - Beats detected: {features['num_beats']}")
-        print(f"  - Spectral centroid: {features['spectral_centroid_mean']:.1f} Hz")
-        print(f"  - RMS energy: {features['rms_energy_mean']:.4f}")
-        print(f"  - Zero crossing rate: {features['zero_crossing_rate_mean']:.4f}")
+        features = _cached_features(audio_file)
+        
+        print(
+            "\nAudio Analysis Results:\n"
+            "  - Tempo: {tempo:.1f} BPM\n"
+            "  - Beats detected: {num_beats}\n"
+            "  - Spectral centroid: {spectral_centroid_mean:.1f} Hz\n"
+            "  - RMS energy: {rms_energy_mean:.4f}\n"
+            "  - Zero crossing rate: {zero_crossing_rate_mean:.4f}".format(**features)
+        )
         
+        # Features are plain float lists, so format each block in one print
         print(f"\nChroma features (pitch classes):")
-        chroma_labels = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        for i, value in enumerate(features['chroma_mean']):
-            print(f"  - {chroma_labels[i]}: {value:.3f}")
+        print("\n".join(
+            f"  - {label}: {value:.3f}"
+            for label, value in zip(NOTE_NAMES, features['chroma_mean'])
+        ))
         
         print(f"\nMFCC features (first 5):")
-        for i, value in enumerate(features['mfcc_mean'][:5]):
-            print(f"  - MFCC {i+1}: {value:.3f}")
+        print("\n".join(
+            f"  - MFCC {i+1}: {value:.3f}"
+            for i, value in enumerate(features['mfcc_mean'][:5])
+        ))
         
     except Exception as e:
         print(f"✗ Error: {str(e)}")
 
 
-def example_4_midi_analysis():
+def example_4_midi_analysis(fx):
     """
     Example 4: MIDI file analysis
+    
+    Args:
+        fx (Fixtures): Shared input files
     """
     print("\nExample 4: MIDI Analysis")
     print("=" * 50)
     
-    midi_file = "test_video.mid"
-    
-    if not os.path.exists(midi_file):
-        print(f"MIDI file not found: {midi_file}")
-        print("Run example 1 or 2 first to create a MIDI file")
+    if fx.midi is None:
         return
     
+    midi_file = str(fx.midi)
+    
     try:
-        transcriber = MusicTranscriber()
-        generator = SheetMusicGenerator()
-        
-        # Analyze MIDI file
+        # Analyze MIDI file (symusic/pretty_midi for events, music21 for notation)
         print("Analyzing MIDI file...")
-        midi_info = transcriber.get_midi_info(midi_file)
+        midi_info, analysis = _load_midi_cached(midi_file)
         
         print(f"\nMIDI Analysis Results:")
         print(f"  - Duration: {midi_info['duration']:.2f} seconds")
@@ -183,12 +515,7 @@ def example_4_midi_analysis():
             print(f"    Range: {inst['note_range'][0]} - {inst['note_range'][1]}")
             print(f"    MIDI range: {inst['pitch_range'][0]} - {inst['pitch_range'][1]}")
         
-        # Load as music21 score for detailed analysis
-        print(f"\nLoading as music21 score...")
-        score = generator.load_midi_to_music21(midi_file)
-        analysis = generator.analyze_musical_content(score)
-        
-        print(f"Musical Analysis:")
+        print(f"\nMusical Analysis:")
         print(f"  - Key signature: {analysis['key_signature']}")
         print(f"  - Time signature: {analysis['time_signature']}")
         print(f"  - Duration: {analysis['duration_quarters']} quarter notes")
@@ -198,37 +525,103 @@ def example_4_midi_analysis():
         print(f"✗ Error: {str(e)}")
 
 
-def example_5_batch_processing():
+def _length_batches(audio_paths, max_num_elements=3_200_000):
+    """
+    Group audio files of similar length for batched transcription
+    
+    Files are sorted by length (read from the header, no decoding) and
+    packed greedily so that each group holds at most max_num_elements
+    samples; a longer file gets a group of its own.
+    
+    Args:
+        audio_paths (list): Paths to the audio files
+        max_num_elements (int): Sample budget of one group
+        
+    Returns:
+        list: Groups of indices into audio_paths
+    """
+    import soundfile as sf
+    
+    frames = [sf.info(path).frames for path in audio_paths]
+    order = sorted(range(len(audio_paths)), key=frames.__getitem__)
+    
+    groups = []
+    group, group_frames = [], 0
+    for i in order:
+        if group and group_frames + frames[i] > max_num_elements:
+            groups.append(group)
+            group, group_frames = [], 0
+        group.append(i)
+        group_frames += frames[i]
+    
+    if group:
+        groups.append(group)
+    
+    return groups
+
+
+def example_5_batch_processing(fx):
     """
     Example 5: Batch processing multiple files
+    
+    Args:
+        fx (Fixtures): Shared input files
     """
     print("\nExample 5: Batch Processing")
     print("=" * 50)
     
     # Create some test files (in practice, you'd have real video files)
-    test_files = ["test_video.mp4"]  # Add more files as needed
+    test_files = [fx.video]  # Add more files as needed
     
     # Filter to existing files
-    existing_files = [f for f in test_files if os.path.exists(f)]
+    existing_files = [str(f) for f in test_files if f is not None]
     
     if not existing_files:
         print("No test files found for batch processing")
         return
     
     try:
-        converter = MP4ToSheetMusicConverter()
-        
         print(f"Processing {len(existing_files)} files...")
         
-        results = converter.batch_convert(
-            existing_files,
-            output_base_dir="batch_output",
-            audio_format="wav",
-            sheet_format="musicxml",
-            onset_threshold=0.5,
-            frame_threshold=0.3,
-            keep_intermediate=False
-        )
+        output_base_dir = Path("batch_output")
+        output_dirs = [output_base_dir / f"{Path(f).stem}_output" for f in existing_files]
+        for output_dir in output_dirs:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Extract all soundtracks before transcribing
+        audio_paths = []
+        for input_file, output_dir in zip(existing_files, output_dirs):
+            audio_path = output_dir / f"{Path(input_file).stem}.wav"
+            audio_paths.append(_get_extractor().extract_audio_from_video(input_file, str(audio_path)))
+        
+        # Transcribe files of similar length together, one model forward
+        # pass per group
+        midi_paths = [[str(output_dir / f"{Path(f).stem}.mid")]
+                      for f, output_dir in zip(existing_files, output_dirs)]
+        for group in _length_batches(audio_paths):
+            _get_transcriber().transcribe_batch(
+                [audio_paths[i] for i in group],
+                [midi_paths[i] for i in group],
+                onset_thresholds=[0.5],
+                frame_thresholds=[0.3]
+            )
+        
+        results = []
+        for input_file, output_dir, audio_path, (midi_path,) in zip(
+                existing_files, output_dirs, audio_paths, midi_paths):
+            try:
+                sheet_path = output_dir / f"{Path(input_file).stem}_sheet.musicxml"
+                sheet_music = _get_generator().generate_sheet_music(
+                    midi_path, str(sheet_path), "musicxml", f"Transcribed from {Path(input_file).name}"
+                )
+                results.append({'success': True, 'sheet_music': sheet_music})
+            except Exception as e:
+                results.append({'success': False, 'error': str(e)})
+            finally:
+                # Intermediate files are not kept
+                for intermediate in (audio_path, midi_path):
+                    if os.path.exists(intermediate):
+                        os.remove(intermediate)
         
         print(f"\nBatch processing completed!")
         successful = sum(1 for r in results if r['success'])
@@ -244,23 +637,22 @@ def example_5_batch_processing():
         print(f"✗ Error: {str(e)}")
 
 
-def example_6_custom_parameters():
+def example_6_custom_parameters(fx):
     """
     Example 6: Using custom transcription parameters
+    
+    Args:
+        fx (Fixtures): Shared input files
     """
     print("\nExample 6: Custom Transcription Parameters")
     print("=" * 50)
     
-    audio_file = "test_video.wav"
-    
-    if not os.path.exists(audio_file):
-        print(f"Audio file not found: {audio_file}")
-        print("Run example 1 or 2 first to create an audio file")
+    if fx.wav is None:
         return
     
+    audio_file = str(fx.wav)
+    
     try:
-        transcriber = MusicTranscriber()
-        
         # Test different parameter combinations
         parameter_sets = [
             {"onset": 0.3, "frame": 0.2, "name": "High Sensitivity"},
@@ -268,22 +660,23 @@ def example_6_custom_parameters():
             {"onset": 0.7, "frame": 0.4, "name": "Low Sensitivity"}
         ]
         
-        for i, params in enumerate(parameter_sets):
-            print(f"\nTesting {params['name']} (onset={params['onset']}, frame={params['frame']})...")
-            
-            midi_path = f"example6_test_{i+1}.mid"
-            
-            transcriber.transcribe_audio_to_midi(
-                audio_file,
-                midi_path,
-                onset_threshold=params['onset'],
-                frame_threshold=params['frame']
-            )
-            
-            # Analyze results
-            midi_info = transcriber.get_midi_info(midi_path)
-            print(f"  - Notes detected: {midi_info['total_notes']}")
-            print(f"  - Duration: {midi_info['duration']:.2f}s")
+        # The audio is the same for every setting, so run the model once
+        # and only repeat the note thresholding
+        midi_paths = [f"example6_test_{i+1}.mid" for i in range(len(parameter_sets))]
+        _get_transcriber().transcribe_batch(
+            [audio_file],
+            [midi_paths],
+            onset_thresholds=[params['onset'] for params in parameter_sets],
+            frame_thresholds=[params['frame'] for params in parameter_sets]
+        )
+        summaries = _midi_summaries(midi_paths)
+        
+        print("".join(
+            f"\nTesting {params['name']} (onset={params['onset']}, frame={params['frame']})...\n"
+            f"  - Notes detected: {total_notes}\n"
+            f"  - Duration: {duration:.2f}s\n"
+            for params, (total_notes, duration) in zip(parameter_sets, summaries)
+        ), end="")
         
         print(f"\nParameter comparison completed!")
         print(f"Check the generated MIDI files to compare results.")
@@ -292,27 +685,102 @@ def example_6_custom_parameters():
         print(f"✗ Error: {str(e)}")
 
 
-def example_7_segment_extraction():
+def _decode_full(video_path):
+    """
+    Decode the whole soundtrack of a video into memory with one ffmpeg run
+    
+    Args:
+        video_path (str): Path to the video file
+        
+    Returns:
+        tuple: (audio_data as float32 array, sample_rate)
+    """
+    import soundfile as sf
+    
+    cmd = [
+        'ffmpeg', '-loglevel', 'error',
+        '-i', video_path,
+        '-vn', '-map', '0:a:0',
+        '-c:a', 'pcm_s16le', '-f', 'wav',
+        'pipe:1'
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=True)
+    return sf.read(io.BytesIO(result.stdout), dtype='float32')
+
+
+def _scratch_root():
+    """
+    Get a directory for short-lived intermediate files, preferring RAM
+    
+    Returns:
+        str: /dev/shm when it is a writable tmpfs, otherwise the system temp directory
+    """
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+
+def _convert_segment(input_stem, name, segment_audio, sample_rate):
+    """
+    Convert one decoded segment to sheet music in a worker process for example 7
+    
+    Args:
+        input_stem (str): Stem of the source file name
+        name (str): Segment name
+        segment_audio (np.ndarray): Samples of the segment
+        sample_rate (int): Sample rate of the samples
+        
+    Returns:
+        dict: Conversion results
+    """
+    import shutil
+    import soundfile as sf
+    
+    output_dir = Path("example7_output") / name.lower()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    # The segment WAV is only read back by the converter, so keep it in RAM
+    scratch_dir = tempfile.mkdtemp(prefix=f"{input_stem}_", dir=_scratch_root())
+    try:
+        audio_path = Path(scratch_dir) / f"{input_stem}_segment.wav"
+        sf.write(str(audio_path), segment_audio, sample_rate)
+        
+        return _get_converter().convert_to_sheet_music(
+            str(audio_path),
+            output_dir,
+            title=f"{name} Segment",
+            keep_intermediate=False
+        )
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def example_7_segment_extraction(fx):
     """
     Example 7: Extract and convert specific segments
+    
+    Args:
+        fx (Fixtures): Shared input files
     """
     print("\nExample 7: Segment Extraction")
     print("=" * 50)
     
-    video_file = "test_video.mp4"
+    if fx.video is None:
+        return
     
-    if not os.path.exists(video_file):
-        print(f"Video file not found: {video_file}")
+    video_file = str(fx.video)
+    
+    manifest = "example7_output/.done"
+    if _is_done(manifest, video_file):
+        print("(cached)")
         return
     
     try:
-        converter = MP4ToSheetMusicConverter()
-        
-        # Get video info first
-        extractor = AudioExtractor()
-        audio_info = extractor.get_audio_info(video_file)
+        # Decode the soundtrack once; the segments are slices of it
+        audio_data, sample_rate = _decode_full(video_file)
+        duration = len(audio_data) / sample_rate
         
-        print(f"Video duration: {audio_info['duration']:.2f} seconds")
+        print(f"Video duration: {duration:.2f} seconds")
         
         # Extract different segments
         segments = [
@@ -321,60 +789,145 @@ def example_7_segment_extraction():
             {"start": 2, "end": 4, "name": "End"}
         ]
         
+        jobs = []
         for segment in segments:
-            if segment["end"] <= audio_info['duration']:
+            if segment["end"] <= duration:
                 print(f"\nExtracting {segment['name']} segment ({segment['start']}s - {segment['end']}s)...")
-                
-                result = converter.convert_audio_segment(
-                    video_file,
-                    segment["start"],
-                    segment["end"],
-                    f"example7_{segment['name'].lower()}_output",
-                    title=f"{segment['name']} Segment",
-                    keep_intermediate=True
-                )
-                
-                if result['success']:
-                    print(f"✓ Segment converted: {result['sheet_music']}")
-                else:
-                    print(f"✗ Segment failed: {result.get('error')}")
+                segment_audio = audio_data[int(segment["start"] * sample_rate):int(segment["end"] * sample_rate)]
+                jobs.append((Path(video_file).stem, segment["name"], segment_audio, sample_rate))
             else:
                 print(f"Skipping {segment['name']} segment (beyond video duration)")
         
+        if not jobs:
+            return
+        
+        # Transcribe the segments in parallel worker processes, spawned since
+        # this process may already have TensorFlow running
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1),
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker) as executor:
+            results = list(executor.map(_convert_segment, *zip(*jobs)))
+        
+        for result in results:
+            if result['success']:
+                print(f"✓ Segment converted: {result['sheet_music']}")
+            else:
+                print(f"✗ Segment failed: {result.get('error')}")
+        
+        if all(result['success'] for result in results):
+            _mark_done(manifest, video_file, [result['sheet_music'] for result in results])
+        
     except Exception as e:
         print(f"✗ Error: {str(e)}")
 
 
+def create_test_video(video_file="test_video.mp4"):
+    """
+    Create the synthetic test video used by the examples, if it is missing
+    
+    The video is encoded to a temporary name and renamed into place, so an
+    existing file is always a complete one and re-runs skip ffmpeg entirely.
+    
+    Args:
+        video_file (str): Path of the test video
+        
+    Returns:
+        bool: True if the test video is available
+    """
+    if os.path.exists(video_file):
+        return True
+    
+    print("Creating test video file...")
+    temp_file = f"{Path(video_file).stem}.partial{Path(video_file).suffix}"
+    cmd = [
+        'ffmpeg', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'sine=frequency=440:duration=5',
+        '-f', 'lavfi', '-i', 'color=c=blue:size=320x240:duration=5',
+        '-c:v', 'libx264', '-preset', 'ultrafast',
+        '-c:a', 'aac',
+        '-shortest',
+        temp_file, '-y'
+    ]
+    
+    try:
+        subprocess.run(cmd, check=True)
+        os.replace(temp_file, video_file)
+        return True
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Could not create test video: {e}")
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        return False
+
+
+def _init_worker():
+    """
+    Set up an example worker process: logging and the transcription model
+    
+    Workers are spawned rather than forked, since forking a process in which
+    TensorFlow has started its threads can deadlock. Each worker loads the
+    model once here, before its first example needs it.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    try:
+        _get_transcriber()._get_model()
+    except Exception as e:
+        print(f"Model preload skipped: {str(e)}")
+
+
+def _safe_call(example_func, fx):
+    """
+    Run one example, reporting instead of raising any error
+    
+    Args:
+        example_func (callable): Example function to run
+        fx (Fixtures): Shared input files
+    """
+    try:
+        example_func(fx)
+    except Exception as e:
+        print(f"Example failed: {str(e)}")
+    
+    print("\n" + "=" * 60)
+
+
 def main():
     """
     Run all examples
     """
+    # The converter reports its progress through logging
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     print("MP4 to Sheet Music Generator - Examples")
     print("=" * 60)
     
     # Check if we have a test video file
-    if not os.path.exists("test_video.mp4"):
-        print("Creating test video file...")
-        os.system('ffmpeg -f lavfi -i "sine=frequency=440:duration=5" -f lavfi -i "color=c=blue:size=320x240:duration=5" -c:v libx264 -c:a aac -shortest test_video.mp4 -y')
-    
-    # Run examples
-    examples = [
-        example_1_basic_conversion,
-        example_2_step_by_step,
-        example_3_audio_analysis,
-        example_4_midi_analysis,
-        example_5_batch_processing,
-        example_6_custom_parameters,
-        example_7_segment_extraction
+    create_test_video()
+    fx = Fixtures.discover()
+    
+    for output_dir in OUTPUT_DIRS:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    # Run examples. Each stage only needs files produced by earlier stages,
+    # so the examples within a stage run concurrently.
+    stages = [
+        [example_1_basic_conversion],
+        [example_2_step_by_step, example_5_batch_processing],
+        [example_3_audio_analysis, example_4_midi_analysis,
+         example_6_custom_parameters, example_7_segment_extraction]
     ]
     
-    for example_func in examples:
-        try:
-            example_func()
-        except Exception as e:
-            print(f"Example failed: {str(e)}")
-        
-        print("\n" + "=" * 60)
+    # Example 1 loads TensorFlow in this process, so workers must not be forked
+    mp_context = multiprocessing.get_context('spawn')
+    
+    for stage in stages:
+        if len(stage) == 1:
+            _safe_call(stage[0], fx)
+        else:
+            with ProcessPoolExecutor(max_workers=len(stage), mp_context=mp_context,
+                                     initializer=_init_worker) as executor:
+                list(executor.map(_safe_call, stage, repeat(fx)))
     
     print("All examples completed!")
 
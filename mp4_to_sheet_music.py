@@ -12,14 +12,283 @@ Version: 1.0.0
 
 import os
 import sys
+import logging
 import argparse
 import time
+import queue
+import threading
+import multiprocessing
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-# Import our custom modules
+# Import our custom modules. The transcriber and sheet generator pull in
+# librosa, basic-pitch and music21, so they are imported on first use and
+# argument errors or --help return without loading them.
 from audio_extractor import AudioExtractor
-from music_transcriber import MusicTranscriber
-from sheet_music_generator import SheetMusicGenerator
+
+
+log = logging.getLogger(__name__)
+
+
+class _DeferredFlushHandler(logging.StreamHandler):
+    """
+    StreamHandler that writes records without flushing after each one
+    
+    The stream is flushed by explicit flush() calls (see _flush_log), so a
+    batch writes its progress once per file instead of once per line.
+    """
+    
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(level=logging.INFO, buffered=False):
+    """
+    Send progress messages to stdout
+    
+    Does nothing if the root logger already has handlers (e.g. when the
+    caller configured logging itself).
+    
+    Args:
+        level (int): Lowest level shown (logging.WARNING for --quiet,
+                     logging.DEBUG for --verbose)
+        buffered (bool): Buffer stdout and write it only when _flush_log is called
+    """
+    handler = None
+    if buffered:
+        try:
+            # A second, fully buffered writer on stdout's descriptor; it
+            # leaves the descriptor open when it is closed
+            stream = open(sys.stdout.fileno(), 'w', buffering=1 << 16,
+                          encoding=sys.stdout.encoding, closefd=False)
+            handler = _DeferredFlushHandler(stream)
+        except (AttributeError, OSError):
+            # stdout is not backed by a file descriptor
+            pass
+    if handler is None:
+        handler = logging.StreamHandler(sys.stdout)
+    
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=level, handlers=[handler])
+
+
+def _flush_log():
+    """Write out messages held by buffered log handlers"""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+class Float32ArenaPool:
+    """
+    Reusable float32 sample buffers for decoding file after file
+    
+    Each slot is allocated on first use and handed out again once released,
+    so a batch of files does not allocate a new multi-megabyte array per
+    file. Requests larger than a slot get a plain array instead.
+    """
+    
+    def __init__(self, max_samples=10 * 60 * 22050, num_slots=2):
+        """
+        Initialize the pool
+        
+        Args:
+            max_samples (int): Size of each slot in samples
+                               (default: 10 minutes at 22.05 kHz)
+            num_slots (int): Number of slots
+        """
+        self.max_samples = max_samples
+        self.slots = [None] * num_slots
+        self.in_use = [False] * num_slots
+        
+        # Buffers may be acquired by a decode thread and released by another
+        self._lock = threading.Lock()
+    
+    def acquire(self, min_len):
+        """
+        Get a float32 buffer of exactly min_len samples
+        
+        Args:
+            min_len (int): Number of samples needed
+            
+        Returns:
+            np.ndarray: A view into a free slot, or a new array if none fits
+        """
+        import numpy as np
+        
+        if min_len <= self.max_samples:
+            with self._lock:
+                for i, in_use in enumerate(self.in_use):
+                    if not in_use:
+                        if self.slots[i] is None:
+                            self.slots[i] = np.empty(self.max_samples, dtype=np.float32)
+                        self.in_use[i] = True
+                        return self.slots[i][:min_len]
+        
+        return np.empty(min_len, dtype=np.float32)
+    
+    def release(self, arr):
+        """
+        Return a buffer obtained from acquire() to the pool
+        
+        Args:
+            arr (np.ndarray): The buffer; arrays not from the pool are ignored
+        """
+        with self._lock:
+            for i, slot in enumerate(self.slots):
+                if slot is not None and arr.base is slot:
+                    self.in_use[i] = False
+                    return
+
+
+def _decode_to_float32(path, target_sr, pool=None):
+    """
+    Decode an audio file to mono float32 samples at the given rate in one pass
+    
+    PyAV decodes and resamples frame by frame in-process; without PyAV the
+    file is loaded with librosa instead.
+    
+    Args:
+        path (str): Path to the audio file
+        target_sr (int): Sample rate of the returned samples
+        pool (Float32ArenaPool, optional): Pool providing the output buffer
+        
+    Returns:
+        np.ndarray: Mono float32 samples at target_sr
+    """
+    import numpy as np
+    
+    try:
+        import av
+    except ImportError:
+        import librosa
+        audio_data, _ = librosa.load(path, sr=target_sr, mono=True, dtype=np.float32)
+        return audio_data
+    
+    with av.open(str(path)) as container:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format='flt', layout='mono', rate=target_sr)
+        chunks = []
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray()[0])
+        
+        # Flush samples still buffered in the resampler
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray()[0])
+    
+    total = sum(len(chunk) for chunk in chunks)
+    audio_data = pool.acquire(total) if pool is not None else np.empty(total, dtype=np.float32)
+    if chunks:
+        np.concatenate(chunks, out=audio_data)
+    
+    return audio_data
+
+
+def _audio_header_info(path):
+    """
+    Read an audio file's duration, sample rate and channels from its header
+    
+    soundfile reads only the header; formats libsndfile does not support are
+    probed through PyAV's demuxer, which does not decode any audio either.
+    
+    Args:
+        path (str): Path to the audio file
+        
+    Returns:
+        dict: 'duration', 'sample_rate' and 'channels', or None if unreadable
+    """
+    try:
+        import soundfile as sf
+        info = sf.info(str(path))
+        return {'duration': info.duration, 'sample_rate': info.samplerate, 'channels': info.channels}
+    except (ImportError, RuntimeError):
+        pass
+    
+    try:
+        import av
+        with av.open(str(path)) as container:
+            stream = container.streams.audio[0]
+            if stream.duration is not None:
+                duration = float(stream.duration * stream.time_base)
+            else:
+                duration = (container.duration or 0) / av.time_base
+            return {
+                'duration': duration,
+                'sample_rate': stream.codec_context.sample_rate,
+                'channels': len(stream.codec_context.layout.channels)
+            }
+    except Exception:
+        return None
+
+
+# Transcriber and sheet generator shared by all converters in a process, so
+# the transcription model is loaded only once
+_transcriber = None
+_sheet_generator = None
+_shared_lock = threading.Lock()
+
+
+def _get_transcriber():
+    """
+    Get the process-wide MusicTranscriber, creating it on first use
+    
+    The instance is shared between converters (and threads); Basic Pitch
+    inference only reads the model weights.
+    
+    Returns:
+        MusicTranscriber: The shared transcriber
+    """
+    global _transcriber
+    with _shared_lock:
+        if _transcriber is None:
+            from music_transcriber import MusicTranscriber
+            _transcriber = MusicTranscriber()
+        return _transcriber
+
+
+def _get_sheet_generator():
+    """
+    Get the process-wide SheetMusicGenerator, creating it on first use
+    
+    Returns:
+        SheetMusicGenerator: The shared sheet generator
+    """
+    global _sheet_generator
+    with _shared_lock:
+        if _sheet_generator is None:
+            from sheet_music_generator import SheetMusicGenerator
+            _sheet_generator = SheetMusicGenerator()
+        return _sheet_generator
+
+
+# Converter of a batch_convert worker process, created on its first job so
+# the models load once per worker
+_worker_converter = None
+
+
+def _convert_one(input_file, output_dir, kwargs):
+    """
+    Convert a single file in a batch_convert worker process
+    
+    Args:
+        input_file (str): Path to the video/audio file
+        output_dir (str or None): Output directory for this file
+        kwargs (dict): Arguments for convert_to_sheet_music
+        
+    Returns:
+        dict: Conversion results
+    """
+    global _worker_converter
+    if _worker_converter is None:
+        _worker_converter = MP4ToSheetMusicConverter()
+    try:
+        return _worker_converter.convert_to_sheet_music(input_file, output_dir, **kwargs)
+    finally:
+        # Worker processes exit without flushing their log handlers
+        _flush_log()
 
 
 class MP4ToSheetMusicConverter:
@@ -28,18 +297,31 @@ class MP4ToSheetMusicConverter:
     Supports both video files (MP4, AVI, MOV, etc.) and audio files (MP3, WAV, FLAC, etc.)
     """
     
+    # Supported file formats
+    VIDEO_FORMATS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v'})
+    AUDIO_FORMATS = frozenset({'.wav', '.mp3', '.flac', '.aac', '.m4a', '.ogg', '.wma'})
+    _EXT_TYPE = {**{ext: 'video' for ext in VIDEO_FORMATS}, **{ext: 'audio' for ext in AUDIO_FORMATS}}
+    
     def __init__(self):
         """Initialize the converter with all required modules"""
         self.audio_extractor = AudioExtractor()
-        self.music_transcriber = MusicTranscriber()
-        self.sheet_generator = SheetMusicGenerator()
         
         # Supported file formats
-        self.video_formats = ['.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v']
-        self.audio_formats = ['.wav', '.mp3', '.flac', '.aac', '.m4a', '.ogg', '.wma']
+        self.video_formats = self.VIDEO_FORMATS
+        self.audio_formats = self.AUDIO_FORMATS
         
-        # Temporary file tracking for cleanup
-        self.temp_files = []
+        # Decode buffers reused across conversions (batch_convert)
+        self.buffer_pool = Float32ArenaPool()
+    
+    @property
+    def music_transcriber(self):
+        """MusicTranscriber: The shared transcriber, loaded on first use"""
+        return _get_transcriber()
+    
+    @property
+    def sheet_generator(self):
+        """SheetMusicGenerator: The shared sheet generator, loaded on first use"""
+        return _get_sheet_generator()
     
     def detect_file_type(self, file_path):
         """
@@ -51,19 +333,13 @@ class MP4ToSheetMusicConverter:
         Returns:
             str: 'video', 'audio', or 'unknown'
         """
-        file_extension = Path(file_path).suffix.lower()
-        
-        if file_extension in self.video_formats:
-            return 'video'
-        elif file_extension in self.audio_formats:
-            return 'audio'
-        else:
-            return 'unknown'
+        return self._EXT_TYPE.get(Path(file_path).suffix.lower(), 'unknown')
     
     def convert_to_sheet_music(self, input_path, output_dir=None, 
                              audio_format='wav', sheet_format='musicxml',
                              onset_threshold=0.5, frame_threshold=0.3,
-                             title=None, keep_intermediate=False):
+                             title=None, keep_intermediate=False, speedup=1.0,
+                             device='auto', decoded_audio=None):
         """
         Complete pipeline: Video/Audio -> Audio -> MIDI -> Sheet Music
         
@@ -76,6 +352,11 @@ class MP4ToSheetMusicConverter:
             frame_threshold (float): Note frame detection threshold
             title (str, optional): Title for the sheet music
             keep_intermediate (bool): Whether to keep intermediate files
+            speedup (float): Time-stretch factor applied to the audio before
+                             transcription to cut model work (1.0 = off)
+            device (str): Transcription device: 'auto', 'cpu', 'cuda' or 'mps'
+            decoded_audio (np.ndarray, optional): Samples already returned by
+                                                  decode_input for this file
             
         Returns:
             dict: Paths to all generated files
@@ -83,33 +364,35 @@ class MP4ToSheetMusicConverter:
         
         start_time = time.time()
         
+        # Decoded samples (released to the buffer pool on failure)
+        audio_data = decoded_audio
+        
+        # Parse the path once; its parts are used throughout
+        input_file = Path(input_path)
+        
         try:
             # Detect file type
-            file_type = self.detect_file_type(input_path)
-            
-            print("=" * 60)
-            print("MUSIC TO SHEET MUSIC CONVERTER")
-            print("=" * 60)
-            print(f"Input file: {input_path}")
-            print(f"File type: {file_type.upper()}")
-            print(f"Audio format: {audio_format}")
-            print(f"Sheet format: {sheet_format}")
-            print(f"Onset threshold: {onset_threshold}")
-            print(f"Frame threshold: {frame_threshold}")
-            print()
+            file_type = self.detect_file_type(input_file)
+            
+            log.info("=" * 60 + "\nMUSIC TO SHEET MUSIC CONVERTER\n" + "=" * 60 + "\n"
+                     "Input file: %s\nFile type: %s\nAudio format: %s\nSheet format: %s\n"
+                     "Onset threshold: %s\nFrame threshold: %s\n",
+                     input_path, file_type.upper(), audio_format, sheet_format,
+                     onset_threshold, frame_threshold)
             
             if file_type == 'unknown':
-                raise ValueError(f"Unsupported file format: {Path(input_path).suffix}")
+                raise ValueError(f"Unsupported file format: {input_file.suffix}")
             
             # Setup output directory
             if output_dir is None:
-                output_dir = Path(input_path).parent / f"{Path(input_path).stem}_output"
+                output_dir = input_file.parent / f"{input_file.stem}_output"
             
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # File paths
-            input_stem = Path(input_path).stem
+            input_stem = input_file.stem
+            
             midi_path = output_dir / f"{input_stem}.mid"
             sheet_path = output_dir / f"{input_stem}_sheet.{sheet_format}"
             
@@ -126,110 +409,127 @@ class MP4ToSheetMusicConverter:
             
             # Step 1: Handle audio extraction/preparation
             if file_type == 'video':
-                print("STEP 1: EXTRACTING AUDIO FROM VIDEO")
-                print("-" * 40)
+                log.info("STEP 1: EXTRACTING AUDIO FROM VIDEO\n" + "-" * 40)
                 
                 audio_info = self.audio_extractor.get_audio_info(input_path)
-                if not audio_info["has_audio"]:
+                if not audio_info['has_audio']:
                     raise ValueError("Video file contains no audio track")
                 
-                print(f"Video audio info:")
-                print(f"  - Duration: {audio_info['duration']:.2f} seconds")
-                print(f"  - Sample rate: {audio_info['sample_rate']} Hz")
-                print(f"  - Channels: {audio_info['channels']}")
-                print()
+                log.info("Video audio info:\n  - Duration: %.2f seconds\n"
+                         "  - Sample rate: %s Hz\n  - Channels: %s\n",
+                         audio_info['duration'], audio_info['sample_rate'], audio_info['channels'])
+                
+                # Decode through a pipe straight to the transcriber's sample rate
+                sr = self.music_transcriber.sample_rate
+                if decoded_audio is not None:
+                    audio_data = decoded_audio
+                else:
+                    audio_data = self.audio_extractor.extract_to_array(
+                        input_path, sr, duration=audio_info['duration']
+                    )
+                
+                if keep_intermediate:
+                    # The audio file is only written when it is kept. It is
+                    # extracted at full rate with the source channels, not
+                    # written from the mono transcription samples above.
+                    audio_path = output_dir / f"{input_stem}.{audio_format}"
+                    extracted_audio = self.audio_extractor.extract_audio_from_video(
+                        input_path, str(audio_path), audio_format
+                    )
+                else:
+                    extracted_audio = None
                 
-                audio_path = output_dir / f"{input_stem}.{audio_format}"
-                extracted_audio = self.audio_extractor.extract_audio_from_video(
-                    input_path, str(audio_path), audio_format
-                )
                 results['audio_file'] = extracted_audio
-                if not keep_intermediate:
-                    self.temp_files.append(extracted_audio)
                 
-                print(f"✓ Audio extraction completed: {extracted_audio}")
-                print()
+                log.info("✓ Audio extraction completed: %s\n", extracted_audio or 'decoded in memory')
                 
             elif file_type == 'audio':
-                print("STEP 1: USING DIRECT AUDIO INPUT")
-                print("-" * 40)
+                log.info("STEP 1: USING DIRECT AUDIO INPUT\n" + "-" * 40)
+                
+                # Get audio info for display from the header alone
+                header = _audio_header_info(input_path)
+                if header is not None:
+                    log.info("Audio file info:\n  - Duration: %.2f seconds\n"
+                             "  - Sample rate: %s Hz\n  - Channels: %s",
+                             header['duration'], header['sample_rate'], header['channels'])
+                else:
+                    log.info("  - Could not read audio file header")
+                
+                # Decode once, straight to the transcriber's sample rate;
+                # analysis and transcription both use these samples
+                sr = self.music_transcriber.sample_rate
+                if decoded_audio is not None:
+                    audio_data = decoded_audio
+                else:
+                    audio_data = _decode_to_float32(input_path, sr, self.buffer_pool)
                 
                 # Check if the audio file is in the desired format
-                input_format = Path(input_path).suffix.lower().lstrip('.')
+                input_format = input_file.suffix.lower().lstrip('.')
                 
                 if input_format == audio_format:
                     # Use the file directly
                     extracted_audio = str(input_path)
-                    print(f"Using audio file directly: {extracted_audio}")
-                else:
-                    # Convert to desired format if needed
+                    log.info("Using audio file directly: %s", extracted_audio)
+                elif keep_intermediate:
+                    # A converted copy is only needed when it is kept
                     audio_path = output_dir / f"{input_stem}.{audio_format}"
-                    print(f"Converting audio format from {input_format} to {audio_format}...")
-                    
-                    # Use librosa to load and save in the desired format
-                    import librosa
-                    import soundfile as sf
-                    
-                    audio_data, sr = librosa.load(input_path, sr=None)
-                    sf.write(str(audio_path), audio_data, sr)
+                    log.info("Converting audio format from %s to %s...", input_format, audio_format)
                     
-                    extracted_audio = str(audio_path)
-                    if not keep_intermediate:
-                        self.temp_files.append(extracted_audio)
+                    # Streams through soundfile (or ffmpeg) without a full librosa decode
+                    extracted_audio = self.audio_extractor.convert_audio_format(
+                        str(input_path), str(audio_path), audio_format
+                    )
+                else:
+                    extracted_audio = None
                 
                 results['audio_file'] = extracted_audio
                 
-                # Get audio info for display
-                try:
-                    import librosa
-                    audio_data, sr = librosa.load(extracted_audio, sr=None)
-                    duration = len(audio_data) / sr
-                    
-                    print(f"Audio file info:")
-                    print(f"  - Duration: {duration:.2f} seconds")
-                    print(f"  - Sample rate: {sr} Hz")
-                    print(f"  - Channels: {1 if len(audio_data.shape) == 1 else audio_data.shape[1]}")
-                except Exception as e:
-                    print(f"  - Could not analyze audio: {str(e)}")
-                
-                print(f"✓ Audio preparation completed: {extracted_audio}")
-                print()
+                log.info("✓ Audio preparation completed: %s\n", extracted_audio or 'decoded in memory')
             
             # Step 2: Transcribe audio to MIDI
-            print("STEP 2: TRANSCRIBING AUDIO TO MIDI")
-            print("-" * 40)
+            log.info("STEP 2: TRANSCRIBING AUDIO TO MIDI\n" + "-" * 40)
             
             # Analyze audio features first
-            features = self.music_transcriber.analyze_audio_features(extracted_audio)
-            print(f"Audio analysis:")
-            print(f"  - Estimated tempo: {features['tempo']:.1f} BPM")
-            print(f"  - Spectral centroid: {features['spectral_centroid_mean']:.1f} Hz")
-            print(f"  - RMS energy: {features['rms_energy_mean']:.4f}")
-            print()
+            features = self.music_transcriber.analyze_audio_features_array(audio_data, sr)
+            log.info("Audio analysis:\n  - Estimated tempo: %.1f BPM\n"
+                     "  - Spectral centroid: %.1f Hz\n  - RMS energy: %.4f\n",
+                     features['tempo'], features['spectral_centroid_mean'],
+                     features['rms_energy_mean'])
             
             # Perform transcription
-            transcribed_midi = self.music_transcriber.transcribe_audio_to_midi(
-                extracted_audio, str(midi_path), onset_threshold, frame_threshold
+            if speedup != 1.0:
+                log.info("Transcribing at %sx speed...", speedup)
+            midi_data, _ = self.music_transcriber.transcribe_array(
+                audio_data, sr, onset_threshold, frame_threshold, speedup, device
             )
-            results['midi_file'] = transcribed_midi
-            if not keep_intermediate:
-                self.temp_files.append(transcribed_midi)
+            
+            # The samples are not needed after transcription. Forget them too:
+            # the slot may go to the next file, and a failure below must not
+            # release it a second time.
+            self.buffer_pool.release(audio_data)
+            audio_data = None
+            
+            # The PrettyMIDI object is passed on directly; the MIDI file is
+            # only written when it is kept
+            if keep_intermediate:
+                midi_data.write(str(midi_path))
+                transcribed_midi = str(midi_path)
+                results['midi_file'] = transcribed_midi
+            else:
+                transcribed_midi = midi_data
             
             # Get MIDI info
             midi_info = self.music_transcriber.get_midi_info(transcribed_midi)
-            print(f"MIDI transcription results:")
-            print(f"  - Total notes: {midi_info['total_notes']}")
-            print(f"  - Duration: {midi_info['duration']:.2f} seconds")
-            print(f"  - Instruments: {midi_info['num_instruments']}")
-            print()
+            log.info("MIDI transcription results:\n  - Total notes: %d\n"
+                     "  - Duration: %.2f seconds\n  - Instruments: %d\n",
+                     midi_info['total_notes'], midi_info['duration'], midi_info['num_instruments'])
             
             # Step 3: Generate sheet music
-            print("STEP 3: GENERATING SHEET MUSIC")
-            print("-" * 40)
+            log.info("STEP 3: GENERATING SHEET MUSIC\n" + "-" * 40)
             
             # Set title if not provided
             if title is None:
-                title = f"Transcribed from {Path(input_path).name}"
+                title = f"Transcribed from {input_file.name}"
             
             generated_sheet = self.sheet_generator.generate_sheet_music(
                 transcribed_midi, str(sheet_path), sheet_format, title
@@ -243,7 +543,7 @@ class MP4ToSheetMusicConverter:
             )
             results['simple_sheet_music'] = str(simple_sheet)
             
-            print()
+            log.info("")
             
             # Calculate processing time
             end_time = time.time()
@@ -252,36 +552,53 @@ class MP4ToSheetMusicConverter:
             results['success'] = True
             
             # Summary
-            print("CONVERSION COMPLETED SUCCESSFULLY!")
-            print("=" * 60)
-            print(f"Processing time: {processing_time:.2f} seconds")
-            print(f"Output directory: {output_dir}")
-            print(f"Generated files:")
-            if results['audio_file'] != str(input_path):  # Only show if we created a new audio file
-                print(f"  - Audio: {results['audio_file']}")
-            print(f"  - MIDI: {results['midi_file']}")
-            print(f"  - Sheet music: {results['sheet_music']}")
-            print(f"  - Simple notation: {results['simple_sheet_music']}")
-            print()
-            
-            if not keep_intermediate:
-                print("Cleaning up intermediate files...")
-                self.cleanup_temp_files()
-                print("✓ Cleanup completed")
+            if log.isEnabledFor(logging.INFO):
+                generated = []
+                if results['audio_file'] not in (None, str(input_path)):  # Only show if we created a new audio file
+                    generated.append(f"  - Audio: {results['audio_file']}")
+                if results['midi_file'] is not None:
+                    generated.append(f"  - MIDI: {results['midi_file']}")
+                generated.append(f"  - Sheet music: {results['sheet_music']}")
+                generated.append(f"  - Simple notation: {results['simple_sheet_music']}")
+                
+                log.info("CONVERSION COMPLETED SUCCESSFULLY!\n" + "=" * 60 + "\n"
+                         "Processing time: %.2f seconds\nOutput directory: %s\n"
+                         "Generated files:\n%s\n",
+                         processing_time, output_dir, "\n".join(generated))
             
             return results
             
         except Exception as e:
-            print(f"\n✗ CONVERSION FAILED: {str(e)}")
+            log.error("\n✗ CONVERSION FAILED: %s", e)
             
-            # Cleanup on failure
-            if not keep_intermediate:
-                self.cleanup_temp_files()
+            if audio_data is not None:
+                self.buffer_pool.release(audio_data)
             
             results['success'] = False
             results['error'] = str(e)
             return results
     
+    def decode_input(self, input_path):
+        """
+        Decode a video or audio file to the samples convert_to_sheet_music transcribes
+        
+        Args:
+            input_path (str): Path to the input file (video or audio)
+            
+        Returns:
+            np.ndarray: Mono float32 samples at the transcriber's sample rate
+        """
+        # Basic Pitch's rate; a constant, so the transcriber need not be loaded
+        sr = 22050
+        file_type = self.detect_file_type(input_path)
+        
+        if file_type == 'video':
+            return self.audio_extractor.extract_to_array(input_path, sr)
+        elif file_type == 'audio':
+            return _decode_to_float32(input_path, sr, self.buffer_pool)
+        else:
+            raise ValueError(f"Unsupported file format: {Path(input_path).suffix}")
+    
     def convert_mp4_to_sheet_music(self, video_path, output_dir=None, **kwargs):
         """
         Backward compatibility method for video files
@@ -312,19 +629,21 @@ class MP4ToSheetMusicConverter:
             dict: Conversion results
         """
         
+        input_file = Path(input_path)
+        
         try:
-            file_type = self.detect_file_type(input_path)
-            print(f"Converting {file_type} segment: {start_time}s - {end_time}s")
+            file_type = self.detect_file_type(input_file)
+            log.info("Converting %s segment: %ss - %ss", file_type, start_time, end_time)
             
             # Setup output directory
             if output_dir is None:
-                output_dir = Path(input_path).parent / f"{Path(input_path).stem}_segment_{start_time}_{end_time}"
+                output_dir = input_file.parent / f"{input_file.stem}_segment_{start_time}_{end_time}"
             
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # Extract segment based on file type
-            input_stem = Path(input_path).stem
+            input_stem = input_file.stem
             
             if file_type == 'video':
                 # Extract audio segment from video
@@ -333,28 +652,31 @@ class MP4ToSheetMusicConverter:
                     input_path, start_time, end_time, str(audio_path)
                 )
             elif file_type == 'audio':
-                # Extract audio segment from audio file
-                import librosa
+                # Extract audio segment from audio file, reading only its frames
                 import soundfile as sf
                 
-                # Load the full audio file
-                audio_data, sr = librosa.load(input_path, sr=None)
-                
-                # Calculate sample indices
-                start_sample = int(start_time * sr)
-                end_sample = int(end_time * sr)
+                audio_path = output_dir / f"{input_stem}_segment.wav"
                 
-                # Extract segment
-                segment_data = audio_data[start_sample:end_sample]
+                try:
+                    sf.info(input_path)
+                    seekable = True
+                except RuntimeError:
+                    # libsndfile cannot open this format (e.g. AAC/M4A)
+                    seekable = False
                 
-                # Save segment
-                audio_path = output_dir / f"{input_stem}_segment.wav"
-                sf.write(str(audio_path), segment_data, sr)
-                extracted_audio = str(audio_path)
+                if seekable:
+                    extracted_audio = self.audio_extractor.extract_audio_segment_from_audio(
+                        input_path, start_time, end_time, str(audio_path)
+                    )
+                else:
+                    # ffmpeg seeks in the input before decoding
+                    extracted_audio = self.audio_extractor.extract_audio_segment(
+                        input_path, start_time, end_time, str(audio_path)
+                    )
                 
-                print(f"✓ Audio segment extracted: {extracted_audio}")
+                log.info("✓ Audio segment extracted: %s", extracted_audio)
             else:
-                raise ValueError(f"Unsupported file format: {Path(input_path).suffix}")
+                raise ValueError(f"Unsupported file format: {input_file.suffix}")
             
             # Continue with normal conversion pipeline using the extracted segment
             return self.convert_to_sheet_music(
@@ -362,68 +684,109 @@ class MP4ToSheetMusicConverter:
             )
             
         except Exception as e:
-            print(f"✗ Segment conversion failed: {str(e)}")
+            log.error("✗ Segment conversion failed: %s", e)
             return {'success': False, 'error': str(e)}
     
-    def batch_convert(self, input_files, output_base_dir=None, **kwargs):
+    def batch_convert(self, input_files, output_base_dir=None, workers=None, **kwargs):
         """
         Convert multiple video/audio files to sheet music
         
+        Files are independent, so they are converted in parallel worker
+        processes; each worker loads the models once.
+        
         Args:
             input_files (list): List of video/audio file paths
             output_base_dir (str, optional): Base output directory
+            workers (int, optional): Number of worker processes. Defaults to
+                                     min(number of files, CPU count), or 1
+                                     when a GPU device is requested
             **kwargs: Additional arguments for conversion
             
         Returns:
-            list: List of conversion results
+            list: List of conversion results, in input order
         """
         
-        results = []
+        if workers is None:
+            if kwargs.get('device', 'auto') in ('cuda', 'mps'):
+                # One model per GPU; several workers would compete for its memory
+                workers = 1
+            else:
+                workers = max(1, min(len(input_files), os.cpu_count() or 1))
         
-        print(f"BATCH CONVERSION: {len(input_files)} files")
-        print("=" * 60)
+        log.info("BATCH CONVERSION: %d files (%d workers)\n" + "=" * 60, len(input_files), workers)
         
-        for i, input_file in enumerate(input_files, 1):
-            file_type = self.detect_file_type(input_file)
-            print(f"\nProcessing file {i}/{len(input_files)}: {input_file} ({file_type.upper()})")
-            
+        output_dirs = []
+        for input_file in input_files:
             # Setup individual output directory
             if output_base_dir:
-                output_dir = Path(output_base_dir) / f"{Path(input_file).stem}_output"
+                output_dirs.append(Path(output_base_dir) / f"{Path(input_file).stem}_output")
             else:
-                output_dir = None
-            
-            # Convert file
-            result = self.convert_to_sheet_music(
-                input_file, output_dir, **kwargs
-            )
-            results.append(result)
-            
-            # Print summary for this file
+                output_dirs.append(None)
+        
+        def report(i, input_file, result):
             if result['success']:
-                print(f"✓ File {i} completed successfully")
+                log.info("✓ File %d/%d completed successfully: %s", i + 1, len(input_files), input_file)
             else:
-                print(f"✗ File {i} failed: {result.get('error', 'Unknown error')}")
+                log.error("✗ File %d/%d failed: %s", i + 1, len(input_files),
+                          result.get('error', 'Unknown error'))
+            # Buffered output is written once per file
+            _flush_log()
+        
+        results = [None] * len(input_files)
+        
+        if workers <= 1:
+            # A decode thread runs ahead, so decoding file N+1 overlaps
+            # with transcribing file N
+            decoded = queue.Queue(maxsize=2)
+            
+            def decode_all():
+                for input_file in input_files:
+                    try:
+                        decoded.put(self.decode_input(input_file))
+                    except Exception:
+                        # convert_to_sheet_music decodes again and reports the error
+                        decoded.put(None)
+            
+            decoder = threading.Thread(target=decode_all, daemon=True)
+            decoder.start()
+            
+            for i, (input_file, output_dir) in enumerate(zip(input_files, output_dirs)):
+                log.info("\nProcessing file %d/%d: %s (%s)", i + 1, len(input_files),
+                         input_file, self.detect_file_type(input_file).upper())
+                results[i] = self.convert_to_sheet_music(
+                    input_file, output_dir, decoded_audio=decoded.get(), **kwargs
+                )
+                report(i, input_file, results[i])
+            
+            decoder.join()
+        else:
+            # Workers are spawned, not forked: this process may already have
+            # loaded the model, and forking with TensorFlow's threads running
+            # can deadlock. They start without logging, so pass on the level.
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=configure_logging,
+                                     initargs=(logging.getLogger().getEffectiveLevel(), True)) as executor:
+                futures = {
+                    executor.submit(_convert_one, input_file, output_dir, kwargs): i
+                    for i, (input_file, output_dir) in enumerate(zip(input_files, output_dirs))
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        results[i] = future.result()
+                    except Exception as e:
+                        results[i] = {'input_file': str(input_files[i]), 'success': False, 'error': str(e)}
+                    report(i, input_files[i], results[i])
         
         # Overall summary
         successful = sum(1 for r in results if r['success'])
-        print(f"\nBATCH CONVERSION SUMMARY:")
-        print(f"  - Total files: {len(input_files)}")
-        print(f"  - Successful: {successful}")
-        print(f"  - Failed: {len(input_files) - successful}")
+        log.info("\nBATCH CONVERSION SUMMARY:\n  - Total files: %d\n"
+                 "  - Successful: %d\n  - Failed: %d",
+                 len(input_files), successful, len(input_files) - successful)
+        _flush_log()
         
         return results
-    
-    def cleanup_temp_files(self):
-        """Clean up temporary files"""
-        for temp_file in self.temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except Exception as e:
-                print(f"Warning: Could not remove {temp_file}: {e}")
-        
-        self.temp_files.clear()
 
 
 def main():
@@ -479,6 +842,12 @@ Supported formats:
                        help='Note onset detection threshold (0.0-1.0, default: 0.5)')
     parser.add_argument('-ft', '--frame-threshold', type=float, default=0.3,
                        help='Note frame detection threshold (0.0-1.0, default: 0.3)')
+    parser.add_argument('--device', default='auto',
+                       choices=['auto', 'cpu', 'cuda', 'mps'],
+                       help='Transcription device (default: auto)')
+    parser.add_argument('-x', '--speedup', type=float, default=1.0,
+                       help='Speed audio up by this factor before transcription; '
+                            'faster but less accurate (default: 1.0)')
     
     # Segment options
     parser.add_argument('-s', '--start-time', type=float,
@@ -491,9 +860,28 @@ Supported formats:
                        help='Title for the sheet music')
     parser.add_argument('-k', '--keep-intermediate', action='store_true',
                        help='Keep intermediate audio and MIDI files')
+    parser.add_argument('-j', '--workers', type=int,
+                       help='Parallel worker processes for batch conversion (default: CPU count)')
+    
+    # Output verbosity
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('-q', '--quiet', action='store_true',
+                          help='Only show warnings and errors')
+    verbosity.add_argument('-v', '--verbose', action='store_true',
+                          help='Show debug messages')
     
     args = parser.parse_args()
     
+    if args.quiet:
+        log_level = logging.WARNING
+    elif args.verbose:
+        log_level = logging.DEBUG
+    else:
+        log_level = logging.INFO
+    
+    # A batch prints a lot; its output is buffered and written once per file
+    configure_logging(log_level, buffered=len(args.input_files) > 1)
+    
     # Validate arguments
     if args.start_time is not None and args.end_time is None:
         parser.error("--end-time is required when --start-time is specified")
@@ -505,20 +893,24 @@ Supported formats:
         if args.start_time >= args.end_time:
             parser.error("--start-time must be less than --end-time")
     
+    if args.speedup <= 0:
+        parser.error("--speedup must be positive")
+    
     # Check input files exist and detect types
     converter = MP4ToSheetMusicConverter()
     
     for input_file in args.input_files:
-        if not os.path.exists(input_file):
-            print(f"Error: Input file not found: {input_file}")
+        input_path = Path(input_file)
+        if not input_path.exists():
+            log.error("Error: Input file not found: %s", input_file)
             sys.exit(1)
         
-        file_type = converter.detect_file_type(input_file)
+        file_type = converter.detect_file_type(input_path)
         if file_type == 'unknown':
-            print(f"Error: Unsupported file format: {input_file}")
-            print("Supported formats:")
-            print("  Video:", ', '.join(converter.video_formats))
-            print("  Audio:", ', '.join(converter.audio_formats))
+            log.error("Error: Unsupported file format: %s\nSupported formats:\n"
+                      "  Video: %s\n  Audio: %s", input_file,
+                      ', '.join(sorted(converter.video_formats)),
+                      ', '.join(sorted(converter.audio_formats)))
             sys.exit(1)
     
     try:
@@ -534,7 +926,9 @@ Supported formats:
                 onset_threshold=args.onset_threshold,
                 frame_threshold=args.frame_threshold,
                 title=args.title,
-                keep_intermediate=args.keep_intermediate
+                keep_intermediate=args.keep_intermediate,
+                speedup=args.speedup,
+                device=args.device
             )
             
             if not result['success']:
@@ -550,7 +944,9 @@ Supported formats:
                 args.onset_threshold,
                 args.frame_threshold,
                 args.title,
-                args.keep_intermediate
+                args.keep_intermediate,
+                args.speedup,
+                args.device
             )
             
             if not result['success']:
@@ -561,27 +957,28 @@ Supported formats:
             results = converter.batch_convert(
                 args.input_files,
                 args.output,
+                workers=args.workers,
                 audio_format=args.audio_format,
                 sheet_format=args.sheet_format,
                 onset_threshold=args.onset_threshold,
                 frame_threshold=args.frame_threshold,
                 title=args.title,
-                keep_intermediate=args.keep_intermediate
+                keep_intermediate=args.keep_intermediate,
+                speedup=args.speedup,
+                device=args.device
             )
             
             # Exit with error if any conversion failed
             if not all(r['success'] for r in results):
                 sys.exit(1)
         
-        print("\n🎵 All conversions completed successfully! 🎵")
+        log.info("\n🎵 All conversions completed successfully! 🎵")
         
     except KeyboardInterrupt:
-        print("\n\nConversion interrupted by user")
-        converter.cleanup_temp_files()
+        log.warning("\n\nConversion interrupted by user")
         sys.exit(1)
     except Exception as e:
-        print(f"\nUnexpected error: {str(e)}")
-        converter.cleanup_temp_files()
+        log.error("\nUnexpected error: %s", e)
         sys.exit(1)
 
 
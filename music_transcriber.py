@@ -8,23 +8,47 @@ and other music transcription techniques.
 
 import os
 import sys
+import warnings
+import threading
+import itertools
+import contextlib
 import numpy as np
 from pathlib import Path
 import librosa
 import pretty_midi
-from basic_pitch.inference import predict
+from basic_pitch.inference import predict, Model, get_audio_input, window_audio_file, unwrap_output
+from basic_pitch.constants import AUDIO_SAMPLE_RATE, AUDIO_N_SAMPLES, FFT_HOP
+from basic_pitch import note_creation as infer
 from basic_pitch import ICASSP_2022_MODEL_PATH
 
 
+# Same windowing and note length as basic_pitch.inference.predict
+N_OVERLAPPING_FRAMES = 30
+OVERLAP_LEN = N_OVERLAPPING_FRAMES * FFT_HOP
+HOP_SIZE = AUDIO_N_SAMPLES - OVERLAP_LEN
+MIN_NOTE_LEN = int(np.round(127.70 / 1000 * (AUDIO_SAMPLE_RATE / FFT_HOP)))
+
+# Windows per model call; bounds peak memory however long the audio is
+PREDICT_BATCH_SIZE = 16
+
+
 class MusicTranscriber:
     """
     A class to handle music transcription from audio to MIDI
     """
     
-    def __init__(self):
-        """Initialize the MusicTranscriber"""
+    def __init__(self, device='auto'):
+        """
+        Initialize the MusicTranscriber
+        
+        Args:
+            device (str): Default inference device: 'auto', 'cpu', 'cuda' or 'mps'
+        """
         self.supported_audio_formats = ['.wav', '.mp3', '.flac', '.aac', '.m4a']
         self.sample_rate = 22050  # Basic Pitch default sample rate
+        self.device = device
+        self.model = None  # Loaded on first batch transcription
+        self._model_lock = threading.Lock()
     
     def is_supported_audio_format(self, file_path):
         """
@@ -57,8 +81,8 @@ class MusicTranscriber:
             raise ValueError(f"Unsupported audio format: {Path(audio_path).suffix}")
         
         try:
-            # Load audio using librosa
-            audio_data, sr = librosa.load(audio_path, sr=self.sample_rate)
+            # Load audio using librosa, as mono float32
+            audio_data, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True, dtype=np.float32)
             
             print(f"Loaded audio: {audio_path}")
             print(f"Duration: {len(audio_data) / sr:.2f} seconds")
@@ -101,14 +125,12 @@ class MusicTranscriber:
             # Load audio
             audio_data, sr = self.load_audio(audio_path)
             
-            # Perform transcription using Basic Pitch
+            # Perform transcription using Basic Pitch on the loaded samples,
+            # rather than letting predict() decode the file again
             print("Running Basic Pitch transcription...")
             
-            model_output, midi_data, note_events = predict(
-                audio_path,
-                model_or_model_path=ICASSP_2022_MODEL_PATH,
-                onset_threshold=onset_threshold,
-                frame_threshold=frame_threshold
+            midi_data, note_events = self.transcribe_array(
+                audio_data, sr, onset_threshold, frame_threshold
             )
             
             # Save MIDI file
@@ -130,6 +152,240 @@ class MusicTranscriber:
             print(f"✗ Transcription failed: {str(e)}")
             raise
     
+    def _get_model(self):
+        """
+        Get the Basic Pitch model, loading it on first use
+        
+        Returns:
+            Model: The loaded model
+        """
+        # Transcribers may be shared between threads; load the model only once
+        with self._model_lock:
+            if self.model is None:
+                self.model = Model(ICASSP_2022_MODEL_PATH)
+            return self.model
+    
+    def _predict(self, windows, device=None):
+        """
+        Run the model on a batch of windows on the requested device
+        
+        Device placement applies to the TensorFlow backend; 'auto' leaves it
+        to the backend, which uses a GPU when one is visible. Other backends
+        (ONNX, TFLite, CoreML) ignore the device, with a warning.
+        
+        Args:
+            windows (np.ndarray): Audio windows, shaped (n, AUDIO_N_SAMPLES, 1)
+            device (str, optional): 'auto', 'cpu', 'cuda' or 'mps'; defaults
+                                    to the transcriber's device
+            
+        Returns:
+            dict: Model outputs ('note', 'onset', 'contour')
+        """
+        device = device or self.device
+        model = self._get_model()
+        scope = contextlib.nullcontext()
+        
+        if device != 'auto':
+            # Model.model_type is an enum member; releases without it only load TensorFlow models
+            model_type = getattr(getattr(model, 'model_type', None), 'name', 'TENSORFLOW')
+            tf = None
+            if model_type == 'TENSORFLOW':
+                try:
+                    import tensorflow as tf
+                except ImportError:
+                    pass
+            
+            if tf is not None:
+                scope = tf.device('/CPU:0' if device == 'cpu' else '/GPU:0')
+            else:
+                warnings.warn(f"device={device!r} is ignored: the {model_type} Basic Pitch "
+                              f"model runs on its backend's default device",
+                              RuntimeWarning, stacklevel=2)
+        
+        with scope:
+            return model.predict(windows)
+    
+    def _predict_in_batches(self, windows, device=None):
+        """
+        Run the model over windows, PREDICT_BATCH_SIZE at a time
+        
+        Only one batch of windows and activations is held at once, so peak
+        memory does not grow with the length of the audio.
+        
+        Args:
+            windows (iterable): Audio windows, each shaped (AUDIO_N_SAMPLES, 1)
+            device (str, optional): 'auto', 'cpu', 'cuda' or 'mps'; defaults
+                                    to the transcriber's device
+            
+        Returns:
+            dict: Model outputs ('note', 'onset', 'contour') for all windows
+        """
+        windows = iter(windows)
+        outputs = {}
+        while True:
+            batch = list(itertools.islice(windows, PREDICT_BATCH_SIZE))
+            if not batch:
+                break
+            for k, v in self._predict(np.stack(batch), device).items():
+                outputs.setdefault(k, []).append(v)
+        
+        return {k: np.concatenate(v) for k, v in outputs.items()}
+    
+    def transcribe_array(self, audio_data, sr, onset_threshold=0.5, frame_threshold=0.3, speedup=1.0,
+                         device=None):
+        """
+        Transcribe audio samples that are already in memory
+        
+        The samples are windowed exactly like Basic Pitch does for a file,
+        so no intermediate audio file is needed.
+        
+        Args:
+            audio_data (np.ndarray): Audio samples; multi-channel input
+                                     (frames, channels) is mixed down to mono
+            sr (int): Sample rate of the samples
+            onset_threshold (float): Threshold for note onset detection (0.0-1.0)
+            frame_threshold (float): Threshold for note frame detection (0.0-1.0)
+            speedup (float): Time-stretch factor applied before transcription.
+                             Values above 1.0 shorten the audio (and the model
+                             work) proportionally; note times are scaled back
+                             afterwards. Very fast passages may lose notes
+            device (str, optional): Inference device; defaults to the
+                                    transcriber's device
+            
+        Returns:
+            tuple: (pretty_midi.PrettyMIDI, list of note events)
+        """
+        
+        if audio_data.ndim > 1:
+            audio_data = audio_data.mean(axis=1)
+        
+        if sr != AUDIO_SAMPLE_RATE:
+            audio_data = librosa.resample(audio_data, orig_sr=sr, target_sr=AUDIO_SAMPLE_RATE)
+        
+        if speedup != 1.0:
+            # Phase vocoder: changes duration but keeps pitch
+            audio_data = librosa.effects.time_stretch(audio_data, rate=speedup)
+        
+        original_length = audio_data.shape[0]
+        audio_data = np.concatenate([
+            np.zeros(OVERLAP_LEN // 2, dtype=np.float32),
+            audio_data.astype(np.float32, copy=False)
+        ])
+        windows = (window for window, _ in window_audio_file(audio_data, HOP_SIZE))
+        
+        model_output = {
+            k: unwrap_output(v, original_length, N_OVERLAPPING_FRAMES)
+            for k, v in self._predict_in_batches(windows, device).items()
+        }
+        
+        midi_data, note_events = infer.model_output_to_notes(
+            model_output,
+            onset_thresh=onset_threshold,
+            frame_thresh=frame_threshold,
+            min_note_len=MIN_NOTE_LEN,
+        )
+        
+        if speedup != 1.0:
+            # Map times in the stretched audio back to the original timeline.
+            # The MIDI has a single fixed tempo, so no tempo changes need scaling.
+            for instrument in midi_data.instruments:
+                for midi_note in instrument.notes:
+                    midi_note.start *= speedup
+                    midi_note.end *= speedup
+                for bend in instrument.pitch_bends:
+                    bend.time *= speedup
+            note_events = [
+                (start * speedup, end * speedup) + tuple(rest)
+                for start, end, *rest in note_events
+            ]
+        
+        return midi_data, note_events
+    
+    def transcribe_batch(self, audio_paths, output_paths=None, onset_thresholds=(0.5,), frame_thresholds=(0.3,)):
+        """
+        Transcribe several audio files with shared model forward passes
+        
+        Basic Pitch cuts audio into fixed-length overlapping windows, so the
+        windows of all files are run through the model together, in batches
+        of PREDICT_BATCH_SIZE. Note creation is then repeated for every
+        (onset, frame) threshold pair, reusing the same model output.
+        
+        Args:
+            audio_paths (list): Paths to the input audio files
+            output_paths (list, optional): For each audio file, a list with one
+                                           MIDI path per threshold pair
+            onset_thresholds (sequence): Onset thresholds (0.0-1.0)
+            frame_thresholds (sequence): Frame thresholds (0.0-1.0), paired
+                                         with onset_thresholds
+            
+        Returns:
+            list: For each audio file, a list of MIDI paths (one per threshold pair)
+        """
+        
+        threshold_sets = list(zip(onset_thresholds, frame_thresholds))
+        if len(threshold_sets) != len(onset_thresholds) or len(threshold_sets) != len(frame_thresholds):
+            raise ValueError("onset_thresholds and frame_thresholds must have the same length")
+        
+        if output_paths is None:
+            output_paths = []
+            for audio_path in audio_paths:
+                audio_stem = Path(audio_path).stem
+                if len(threshold_sets) == 1:
+                    output_paths.append([f"{audio_stem}.mid"])
+                else:
+                    output_paths.append([f"{audio_stem}_{i+1}.mid" for i in range(len(threshold_sets))])
+        
+        for audio_path in audio_paths:
+            if not os.path.exists(audio_path):
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        
+        try:
+            windows = []
+            window_counts = []
+            original_lengths = []
+            for audio_path in audio_paths:
+                count = 0
+                for window, _, original_length in get_audio_input(audio_path, OVERLAP_LEN, HOP_SIZE):
+                    windows.append(window)
+                    count += 1
+                window_counts.append(count)
+                original_lengths.append(original_length)
+            
+            print(f"Running Basic Pitch on {len(windows)} windows from {len(audio_paths)} files...")
+            # Files share model calls, but each call is capped at
+            # PREDICT_BATCH_SIZE windows; the per-file counts split the output
+            batch_output = self._predict_in_batches(window[0] for window in windows)
+            
+            results = []
+            start = 0
+            for audio_path, paths, count, original_length in zip(
+                    audio_paths, output_paths, window_counts, original_lengths):
+                model_output = {
+                    k: unwrap_output(v[start:start + count], original_length, N_OVERLAPPING_FRAMES)
+                    for k, v in batch_output.items()
+                }
+                start += count
+                
+                for (onset, frame), midi_path in zip(threshold_sets, paths):
+                    midi_data, note_events = infer.model_output_to_notes(
+                        model_output,
+                        onset_thresh=onset,
+                        frame_thresh=frame,
+                        min_note_len=MIN_NOTE_LEN,
+                    )
+                    Path(midi_path).parent.mkdir(parents=True, exist_ok=True)
+                    midi_data.write(midi_path)
+                    print(f"✓ {audio_path} (onset={onset}, frame={frame}): "
+                          f"{len(note_events)} notes -> {midi_path}")
+                
+                results.append(list(paths))
+            
+            return results
+            
+        except Exception as e:
+            print(f"✗ Batch transcription failed: {str(e)}")
+            raise
+    
     def analyze_audio_features(self, audio_path):
         """
         Analyze audio features for better transcription understanding
@@ -141,20 +397,52 @@ class MusicTranscriber:
             dict: Audio analysis results
         """
         
+        # Load audio
+        audio_data, sr = self.load_audio(audio_path)
+        
+        features = self.analyze_audio_features_array(audio_data, sr)
+        
+        print(f"Audio analysis completed for: {audio_path}")
+        print(f"Estimated tempo: {features['tempo']:.1f} BPM")
+        print(f"Number of beats: {features['num_beats']}")
+        
+        return features
+    
+    def analyze_audio_features_array(self, audio_data, sr):
+        """
+        Analyze audio features of samples that are already in memory
+        
+        Args:
+            audio_data (np.ndarray): Audio samples; multi-channel input
+                                     (frames, channels) is mixed down to mono
+            sr (int): Sample rate of the samples
+            
+        Returns:
+            dict: Audio analysis results
+        """
+        
         try:
-            # Load audio
-            audio_data, sr = self.load_audio(audio_path)
+            if audio_data.ndim > 1:
+                audio_data = audio_data.mean(axis=1)
             
             # Extract features
             features = {}
             
+            # One STFT (n_fft=2048, hop_length=512, librosa's defaults) and
+            # mel spectrogram shared by all spectral features below, instead
+            # of each of them computing its own
+            S = np.abs(librosa.stft(audio_data, n_fft=2048, hop_length=512))
+            power = S ** 2
+            log_mel = librosa.power_to_db(librosa.feature.melspectrogram(S=power, sr=sr))
+            
             # Tempo estimation
-            tempo, beats = librosa.beat.beat_track(y=audio_data, sr=sr)
+            onset_envelope = librosa.onset.onset_strength(S=log_mel, sr=sr)
+            tempo, beats = librosa.beat.beat_track(onset_envelope=onset_envelope, sr=sr)
             features['tempo'] = float(tempo)
             features['num_beats'] = len(beats)
             
             # Spectral features
-            spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sr)[0]
+            spectral_centroids = librosa.feature.spectral_centroid(S=S, sr=sr)[0]
             features['spectral_centroid_mean'] = float(np.mean(spectral_centroids))
             features['spectral_centroid_std'] = float(np.std(spectral_centroids))
             
@@ -162,23 +450,19 @@ class MusicTranscriber:
             zcr = librosa.feature.zero_crossing_rate(audio_data)[0]
             features['zero_crossing_rate_mean'] = float(np.mean(zcr))
             
-            # RMS energy
-            rms = librosa.feature.rms(y=audio_data)[0]
+            # RMS energy (from the windowed spectrum)
+            rms = librosa.feature.rms(S=S)[0]
             features['rms_energy_mean'] = float(np.mean(rms))
             features['rms_energy_std'] = float(np.std(rms))
             
             # Chroma features (pitch class profiles)
-            chroma = librosa.feature.chroma_stft(y=audio_data, sr=sr)
+            chroma = librosa.feature.chroma_stft(S=power, sr=sr)
             features['chroma_mean'] = np.mean(chroma, axis=1).tolist()
             
             # MFCC features
-            mfccs = librosa.feature.mfcc(y=audio_data, sr=sr, n_mfcc=13)
+            mfccs = librosa.feature.mfcc(S=log_mel, sr=sr, n_mfcc=13)
             features['mfcc_mean'] = np.mean(mfccs, axis=1).tolist()
             
-            print(f"Audio analysis completed for: {audio_path}")
-            print(f"Estimated tempo: {features['tempo']:.1f} BPM")
-            print(f"Number of beats: {features['num_beats']}")
-            
             return features
             
         except Exception as e:
@@ -189,17 +473,21 @@ class MusicTranscriber:
         Get information about a MIDI file
         
         Args:
-            midi_path (str): Path to the MIDI file
+            midi_path (str or pretty_midi.PrettyMIDI): Path to the MIDI file,
+                                                       or already loaded MIDI data
             
         Returns:
             dict: MIDI file information
         """
         
-        if not os.path.exists(midi_path):
+        if isinstance(midi_path, pretty_midi.PrettyMIDI):
+            midi_data = midi_path
+        elif not os.path.exists(midi_path):
             raise FileNotFoundError(f"MIDI file not found: {midi_path}")
         
         try:
-            midi_data = pretty_midi.PrettyMIDI(midi_path)
+            if not isinstance(midi_path, pretty_midi.PrettyMIDI):
+                midi_data = pretty_midi.PrettyMIDI(midi_path)
             
             # Get initial tempo safely
             try:
@@ -207,31 +495,34 @@ class MusicTranscriber:
             except:
                 initial_tempo = 120.0  # Default tempo
             
-            info = {
-                'duration': midi_data.get_end_time(),
-                'num_instruments': len(midi_data.instruments),
-                'total_notes': sum(len(instrument.notes) for instrument in midi_data.instruments),
-                'initial_tempo': initial_tempo
-            }
-            
-            # Get note range for each instrument
-            info['instruments'] = []
+            # Count notes and get the note range of each instrument in one pass
+            total_notes = 0
+            instruments = []
             for i, instrument in enumerate(midi_data.instruments):
-                if len(instrument.notes) > 0:
-                    pitches = [note.pitch for note in instrument.notes]
-                    inst_info = {
+                num_notes = len(instrument.notes)
+                total_notes += num_notes
+                if num_notes > 0:
+                    pitches = np.fromiter((note.pitch for note in instrument.notes),
+                                          dtype=np.int16, count=num_notes)
+                    low, high = int(pitches.min()), int(pitches.max())
+                    instruments.append({
                         'index': i,
                         'name': instrument.name,
                         'program': instrument.program,
                         'is_drum': instrument.is_drum,
-                        'num_notes': len(instrument.notes),
-                        'pitch_range': [min(pitches), max(pitches)],
-                        'note_range': [pretty_midi.note_number_to_name(min(pitches)),
-                                     pretty_midi.note_number_to_name(max(pitches))]
-                    }
-                    info['instruments'].append(inst_info)
-            
-            return info
+                        'num_notes': num_notes,
+                        'pitch_range': [low, high],
+                        'note_range': [pretty_midi.note_number_to_name(low),
+                                     pretty_midi.note_number_to_name(high)]
+                    })
+            
+            return {
+                'duration': midi_data.get_end_time(),
+                'num_instruments': len(midi_data.instruments),
+                'total_notes': total_notes,
+                'initial_tempo': initial_tempo,
+                'instruments': instruments
+            }
             
         except Exception as e:
             raise Exception(f"Failed to analyze MIDI file: {str(e)}")
@@ -8,12 +8,229 @@ with ONNX model support for Python 3.12 compatibility.
 
 import os
 import sys
+import logging
+import tempfile
+import threading
+import multiprocessing
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import librosa
+import soundfile as sf
 import pretty_midi
-from basic_pitch.inference import Model
 import basic_pitch
+from basic_pitch.constants import AUDIO_SAMPLE_RATE, AUDIO_N_SAMPLES, ANNOTATIONS_FPS, FFT_HOP
+
+from user_cache import CACHE_ROOT
+
+
+log = logging.getLogger(__name__)
+
+# ONNX model input length: 43844 samples (about 1.99 seconds)
+CHUNK_SIZE = AUDIO_N_SAMPLES
+
+# Chunks overlap by 30 frames, as in basic_pitch.inference.predict; half of
+# the overlap is cropped from each side of every chunk's predictions
+N_OVERLAPPING_FRAMES = 30
+N_CROP_FRAMES = N_OVERLAPPING_FRAMES // 2
+OVERLAP_LEN = N_OVERLAPPING_FRAMES * FFT_HOP
+HOP_SIZE = CHUNK_SIZE - OVERLAP_LEN
+
+# Tensor names of the Basic Pitch ONNX graph (as used by basic_pitch.inference.Model)
+ONNX_INPUT_NAME = 'serving_default_input_2:0'
+ONNX_OUTPUT_NAMES = {
+    'note': 'StatefulPartitionedCall:1',
+    'onset': 'StatefulPartitionedCall:2',
+    'contour': 'StatefulPartitionedCall:0',
+}
+
+# Execution providers to use when available, fastest first
+ONNX_PROVIDERS = ['CUDAExecutionProvider', 'CoreMLExecutionProvider', 'CPUExecutionProvider']
+
+# int8 copies of the model for CPU-only inference are created on first use
+# in the user cache, next to the extracted audio (clear_cache keeps them)
+MODEL_CACHE_DIR = CACHE_ROOT / 'models'
+
+
+# ONNX sessions shared by all transcribers in a process, keyed by model path
+# and providers, so each model is loaded and optimized only once
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _reset_sessions():
+    """
+    Forget the sessions inherited from a parent process
+    
+    A session's intra-op thread pool does not survive fork(), so a child must
+    never run a session the parent created; it loads its own instead.
+    """
+    global _sessions_lock
+    _sessions.clear()
+    _sessions_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_sessions)
+
+
+def _get_session(onnx_model_path, providers):
+    """
+    Get the process-wide InferenceSession for a model, creating it on first use
+    
+    Args:
+        onnx_model_path (str): Path to the ONNX model
+        providers (list): Execution providers, in order of preference
+        
+    Returns:
+        onnxruntime.InferenceSession: The shared session
+    """
+    key = (onnx_model_path, tuple(providers))
+    with _sessions_lock:
+        if key not in _sessions:
+            import onnxruntime as ort
+            
+            # intra_op_num_threads keeps its default of one thread per physical core
+            sess_options = ort.SessionOptions()
+            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            
+            _sessions[key] = ort.InferenceSession(onnx_model_path, sess_options, providers=providers)
+        return _sessions[key]
+
+
+# Shortest note kept when converting predictions to MIDI, in seconds
+MIN_NOTE_SECONDS = 0.05
+
+# numba-compiled _note_segments_kernel; False once numba was found missing
+_note_kernel = None
+
+
+def _note_segments_kernel(note_predictions, onset_predictions, frame_threshold, onset_threshold,
+                          time_per_frame, min_note_seconds):
+    """
+    Find note segments in one pass over the raw predictions
+    
+    A note starts on a frame whose frame or onset prediction is above its
+    threshold and lasts while that holds; a note still sounding at the end
+    stops at the last frame. Written for numba; see _compiled_note_kernel.
+    
+    Args:
+        note_predictions (np.ndarray): Frame predictions, shape (frames, pitches)
+        onset_predictions (np.ndarray): Onset predictions, shape (frames, pitches)
+        frame_threshold (float): Frame threshold
+        onset_threshold (float): Onset threshold
+        time_per_frame (float): Seconds per prediction frame
+        min_note_seconds (float): Shortest note kept
+        
+    Returns:
+        tuple: (pitch indices, start times, end times) in the order the notes end
+    """
+    n_frames, n_pitches = note_predictions.shape
+    
+    capacity = 1024
+    pitches = np.empty(capacity, dtype=np.int64)
+    starts = np.empty(capacity, dtype=np.float64)
+    ends = np.empty(capacity, dtype=np.float64)
+    count = 0
+    
+    # Start frame of the note sounding at each pitch, or -1
+    note_start = np.full(n_pitches, -1, dtype=np.int64)
+    
+    # One step past the last frame ends the notes still sounding
+    for t in range(n_frames + 1):
+        for p in range(n_pitches):
+            active = t < n_frames and (note_predictions[t, p] > frame_threshold
+                                       or onset_predictions[t, p] > onset_threshold)
+            if active:
+                if note_start[p] < 0:
+                    note_start[p] = t
+            elif note_start[p] >= 0:
+                start_time = note_start[p] * time_per_frame
+                end_time = min(t, n_frames - 1) * time_per_frame
+                note_start[p] = -1
+                
+                if end_time - start_time >= min_note_seconds:
+                    if count == capacity:
+                        capacity *= 2
+                        pitches = np.concatenate((pitches, np.empty(capacity - count, dtype=np.int64)))
+                        starts = np.concatenate((starts, np.empty(capacity - count, dtype=np.float64)))
+                        ends = np.concatenate((ends, np.empty(capacity - count, dtype=np.float64)))
+                    pitches[count] = p
+                    starts[count] = start_time
+                    ends[count] = end_time
+                    count += 1
+    
+    return pitches[:count], starts[:count], ends[:count]
+
+
+def _compiled_note_kernel():
+    """
+    Get the numba-compiled _note_segments_kernel, compiling it on first use
+    
+    Returns:
+        callable: Compiled kernel, or None if numba is not installed
+    """
+    global _note_kernel
+    if _note_kernel is None:
+        try:
+            import numba
+            _note_kernel = numba.njit(cache=True)(_note_segments_kernel)
+        except ImportError:
+            _note_kernel = False
+    return _note_kernel or None
+
+
+def _note_segments_numpy(note_predictions, onset_predictions, frame_threshold, onset_threshold,
+                         time_per_frame, min_note_seconds):
+    """
+    Find note segments with NumPy; same results as _note_segments_kernel
+    
+    Args:
+        note_predictions (np.ndarray): Frame predictions, shape (frames, pitches)
+        onset_predictions (np.ndarray): Onset predictions, shape (frames, pitches)
+        frame_threshold (float): Frame threshold
+        onset_threshold (float): Onset threshold
+        time_per_frame (float): Seconds per prediction frame
+        min_note_seconds (float): Shortest note kept
+        
+    Returns:
+        tuple: (pitch indices, start times, end times) ordered by pitch, then start
+    """
+    # Apply thresholds
+    note_activations = note_predictions > frame_threshold
+    onset_activations = onset_predictions > onset_threshold
+    
+    # Frames where a note sounds or starts, packed 8 keys to a byte (11
+    # bytes per frame) and padded with a silent frame at both ends, so
+    # that every note has a rising and a falling edge
+    active = note_activations | onset_activations
+    n_frames, n_pitches = active.shape
+    packed = np.pad(np.packbits(active, axis=1), ((1, 1), (0, 0)))
+    
+    # Row i of the XOR compares frame i with frame i - 1; only the rows
+    # where some key changes are unpacked again
+    changes = packed[1:] ^ packed[:-1]
+    rows = np.flatnonzero(changes.any(axis=1))
+    changed = np.unpackbits(changes[rows], axis=1, count=n_pitches).view(bool)
+    sounding = np.unpackbits(packed[1:][rows], axis=1, count=n_pitches).view(bool)
+    
+    # Transposed, nonzero() orders by pitch, then frame, so starts and
+    # ends pair up
+    pitch_indices, start_rows = np.nonzero((changed & sounding).T)
+    _, end_rows = np.nonzero((changed & ~sounding).T)
+    start_frames = rows[start_rows]
+    end_frames = rows[end_rows]
+    
+    # A note still sounding at the end stops at the last frame
+    end_frames = np.minimum(end_frames, n_frames - 1)
+    
+    start_times = start_frames * time_per_frame
+    end_times = end_frames * time_per_frame
+    
+    # Minimum note length
+    keep = end_times - start_times >= min_note_seconds
+    
+    return pitch_indices[keep], start_times[keep], end_times[keep]
 
 
 class MusicTranscriber:
@@ -21,11 +238,20 @@ class MusicTranscriber:
     A class to handle music transcription from audio to MIDI
     """
     
-    def __init__(self):
-        """Initialize the MusicTranscriber"""
+    def __init__(self, batch_size=16, quantized=False):
+        """
+        Initialize the MusicTranscriber
+        
+        Args:
+            batch_size (int): Number of audio chunks passed to the model per call
+            quantized (bool): Use an int8-quantized model when inference runs
+                              on the CPU; faster, slightly less accurate
+        """
         self.supported_audio_formats = ['.wav', '.mp3', '.flac', '.aac', '.m4a']
         self.sample_rate = 22050  # Basic Pitch default sample rate
-        self.model = None
+        self.batch_size = batch_size
+        self.quantized = quantized
+        self.session = None
         self._load_model()
     
     def _load_model(self):
@@ -38,16 +264,87 @@ class MusicTranscriber:
             )
             
             if os.path.exists(onnx_model_path):
-                print("Loading ONNX model for Basic Pitch...")
-                self.model = Model(onnx_model_path)
-                print("✓ ONNX model loaded successfully!")
+                import onnxruntime as ort
+                
+                log.info("Loading ONNX model for Basic Pitch...")
+                
+                available = ort.get_available_providers()
+                providers = [p for p in ONNX_PROVIDERS if p in available]
+                
+                # GPU providers keep the FP32 model
+                if self.quantized and providers == ['CPUExecutionProvider']:
+                    onnx_model_path = self._get_quantized_model(onnx_model_path)
+                
+                self.session = _get_session(onnx_model_path, providers)
+                
+                # The session is shared; the input buffer and bindings are
+                # per transcriber. Full batches are copied into one
+                # preallocated input on the session's device; outputs stay
+                # bound to the same device
+                device = 'cuda' if self.session.get_providers()[0] == 'CUDAExecutionProvider' else 'cpu'
+                self._input_value = ort.OrtValue.ortvalue_from_numpy(
+                    np.empty((self.batch_size, CHUNK_SIZE, 1), dtype=np.float32), device, 0
+                )
+                self._io_binding = self.session.io_binding()
+                for name in ONNX_OUTPUT_NAMES.values():
+                    self._io_binding.bind_output(name, device)
+                
+                log.info("✓ ONNX model loaded successfully! (%s)", ', '.join(self.session.get_providers()))
             else:
                 raise FileNotFoundError(f"ONNX model not found at {onnx_model_path}")
                 
         except Exception as e:
-            print(f"✗ Failed to load ONNX model: {e}")
+            log.error("✗ Failed to load ONNX model: %s", e)
             raise
     
+    def _get_quantized_model(self, onnx_model_path):
+        """
+        Get the int8 version of the ONNX model, quantizing it on first use
+        
+        The model is quantized into a temporary file that is renamed into
+        place, so other processes (transcribe_many workers) never load a
+        half-written model. A lock file keeps them from quantizing it twice.
+        
+        Args:
+            onnx_model_path (str): Path to the FP32 model
+            
+        Returns:
+            str: Path to the int8 model
+        """
+        # Keyed by the FP32 model's size and mtime, so a basic-pitch upgrade
+        # gets a fresh copy
+        stat = os.stat(onnx_model_path)
+        quantized_path = MODEL_CACHE_DIR / (
+            f"{Path(onnx_model_path).stem}-{stat.st_size}-{stat.st_mtime_ns}.int8.onnx"
+        )
+        if quantized_path.exists():
+            return str(quantized_path)
+        
+        MODEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(f"{quantized_path}.lock", 'w') as lock_file:
+            try:
+                import fcntl
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except ImportError:
+                # No flock (Windows): concurrent processes may both quantize,
+                # but the atomic rename still keeps the model whole
+                pass
+            
+            if not quantized_path.exists():
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                
+                log.info("Quantizing ONNX model to int8 (first run only)...")
+                fd, tmp_path = tempfile.mkstemp(suffix='.onnx', dir=MODEL_CACHE_DIR)
+                os.close(fd)
+                try:
+                    quantize_dynamic(onnx_model_path, tmp_path, weight_type=QuantType.QInt8)
+                    os.replace(tmp_path, quantized_path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+        
+        return str(quantized_path)
+    
     def is_supported_audio_format(self, file_path):
         """
         Check if the audio file format is supported
@@ -79,19 +376,50 @@ class MusicTranscriber:
             raise ValueError(f"Unsupported audio format: {Path(audio_path).suffix}")
         
         try:
-            # Load audio using librosa
-            audio_data, sr = librosa.load(audio_path, sr=self.sample_rate)
+            if Path(audio_path).suffix.lower() in ('.wav', '.flac'):
+                # libsndfile reads these natively; only resample if needed
+                audio_data, sr = sf.read(audio_path, dtype='float32')
+                if audio_data.ndim == 2:
+                    audio_data = audio_data.mean(axis=1)
+                if sr != self.sample_rate:
+                    audio_data = librosa.resample(
+                        audio_data, orig_sr=sr, target_sr=self.sample_rate, res_type='soxr_hq'
+                    )
+                    sr = self.sample_rate
+            else:
+                # Load compressed formats using librosa
+                audio_data, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True, dtype=np.float32)
             
-            print(f"Loaded audio: {audio_path}")
-            print(f"Duration: {len(audio_data) / sr:.2f} seconds")
-            print(f"Sample rate: {sr} Hz")
-            print(f"Audio shape: {audio_data.shape}")
+            log.info("Loaded audio: %s\nDuration: %.2f seconds\nSample rate: %d Hz\nAudio shape: %s",
+                     audio_path, len(audio_data) / sr, sr, audio_data.shape)
             
             return audio_data, sr
             
         except Exception as e:
             raise Exception(f"Failed to load audio: {str(e)}")
     
+    def _run_batch(self, batch):
+        """
+        Run the ONNX model on one batch of chunks
+        
+        Args:
+            batch (np.ndarray): Contiguous float32 chunks, shape (batch, CHUNK_SIZE, 1)
+            
+        Returns:
+            dict: 'note', 'onset' and 'contour' predictions for the batch
+        """
+        if len(batch) == self.batch_size:
+            self._input_value.update_inplace(batch)
+            self._io_binding.bind_ortvalue_input(ONNX_INPUT_NAME, self._input_value)
+        else:
+            # The last, partial batch does not fit the preallocated input
+            self._io_binding.bind_cpu_input(ONNX_INPUT_NAME, batch)
+        
+        self.session.run_with_iobinding(self._io_binding)
+        outputs = self._io_binding.copy_outputs_to_cpu()
+        
+        return dict(zip(ONNX_OUTPUT_NAMES, outputs))
+    
     def _predict_with_onnx_model(self, audio_data):
         """
         Predict using ONNX model with proper chunking
@@ -102,42 +430,154 @@ class MusicTranscriber:
         Returns:
             dict: Model predictions
         """
-        # ONNX model expects chunks of 43844 samples (about 1.99 seconds)
-        chunk_size = 43844
-        hop_size = chunk_size // 2  # 50% overlap
+        original_length = len(audio_data)
         
-        # Pad audio if necessary
-        if len(audio_data) < chunk_size:
-            audio_data = np.pad(audio_data, (0, chunk_size - len(audio_data)))
+        # Zero-pad half an overlap in front, so the first frames survive
+        # cropping, and the tail up to the end of the last chunk
+        n_chunks = -(-(original_length + OVERLAP_LEN // 2) // HOP_SIZE)
+        padded = np.zeros((n_chunks - 1) * HOP_SIZE + CHUNK_SIZE, dtype=np.float32)
+        padded[OVERLAP_LEN // 2:OVERLAP_LEN // 2 + original_length] = audio_data
+        
+        # All chunks as strided views into the audio, without copying
+        chunks = np.lib.stride_tricks.sliding_window_view(padded, CHUNK_SIZE)[::HOP_SIZE]
+        
+        predictions = self._predict_chunks([chunks], n_chunks)
+        
+        # Drop the frames of the tail padding
+        n_frames = int(np.floor(original_length * ANNOTATIONS_FPS / AUDIO_SAMPLE_RATE))
+        return {key: value[:, :n_frames] for key, value in predictions.items()}
+    
+    def _predict_streaming(self, audio_path):
+        """
+        Predict from a WAV/FLAC file read block by block
         
-        # Process audio in chunks
-        all_predictions = {'note': [], 'onset': [], 'contour': []}
+        Only about one batch of audio is held in memory at a time; the
+        predictions are the same as _predict_with_onnx_model's for the
+        whole file.
         
-        for start in range(0, len(audio_data) - chunk_size + 1, hop_size):
-            chunk = audio_data[start:start + chunk_size]
+        Args:
+            audio_path (str): Path to a file soundfile can read
+            
+        Returns:
+            dict: Model predictions
+        """
+        
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        
+        # Resampling adds at most one sample to the scaled length
+        info = sf.info(audio_path)
+        max_length = int(np.ceil(info.frames * self.sample_rate / info.samplerate)) + 1
+        max_chunks = -(-(max_length + OVERLAP_LEN // 2) // HOP_SIZE)
+        
+        original_length = 0
+        
+        def chunk_groups():
+            nonlocal original_length
             
-            # Reshape for model input: (batch, time, channels)
-            chunk_input = chunk.reshape(1, chunk_size, 1).astype(np.float32)
+            # Samples from the start of the next chunk on, beginning with
+            # the same front padding as _predict_with_onnx_model
+            pending = np.zeros(OVERLAP_LEN // 2, dtype=np.float32)
+            n_emitted = 0
             
-            # Get prediction
-            prediction = self.model.predict(chunk_input)
+            for block in self._stream_audio(audio_path, HOP_SIZE * self.batch_size):
+                original_length += len(block)
+                pending = np.concatenate([pending, block])
+                
+                # Chunks that lie entirely within the pending samples
+                n_ready = (len(pending) - CHUNK_SIZE) // HOP_SIZE + 1 if len(pending) >= CHUNK_SIZE else 0
+                if n_ready:
+                    yield np.lib.stride_tricks.sliding_window_view(pending, CHUNK_SIZE)[::HOP_SIZE][:n_ready]
+                    pending = pending[n_ready * HOP_SIZE:]
+                    n_emitted += n_ready
+            
+            # The remaining chunks, zero-padded at the end
+            n_rest = -(-(original_length + OVERLAP_LEN // 2) // HOP_SIZE) - n_emitted
+            if n_rest:
+                tail = np.zeros((n_rest - 1) * HOP_SIZE + CHUNK_SIZE, dtype=np.float32)
+                tail[:len(pending)] = pending
+                yield np.lib.stride_tricks.sliding_window_view(tail, CHUNK_SIZE)[::HOP_SIZE]
+        
+        predictions = self._predict_chunks(chunk_groups(), max_chunks)
+        
+        # Drop the frames of the tail padding (and of the length estimate)
+        n_frames = int(np.floor(original_length * ANNOTATIONS_FPS / AUDIO_SAMPLE_RATE))
+        return {key: value[:, :n_frames] for key, value in predictions.items()}
+    
+    def _stream_audio(self, audio_path, block_size):
+        """
+        Read an audio file as mono float32 blocks at the model's sample rate
+        
+        Args:
+            audio_path (str): Path to a file soundfile can read
+            block_size (int): Frames read from the file per block
             
-            # Store predictions
-            for key in all_predictions:
-                all_predictions[key].append(prediction[key])
+        Yields:
+            np.ndarray: Consecutive blocks of samples
+        """
+        info = sf.info(audio_path)
+        
+        resampler = None
+        if info.samplerate != self.sample_rate:
+            import soxr
+            resampler = soxr.ResampleStream(info.samplerate, self.sample_rate, 1, dtype='float32')
+        
+        for block in sf.blocks(audio_path, blocksize=block_size, dtype='float32', always_2d=True):
+            block = block.mean(axis=1)
+            if resampler is not None:
+                block = resampler.resample_chunk(block)
+            yield block
+        
+        if resampler is not None:
+            # Samples still held back by the resampler
+            yield resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+    
+    def _predict_chunks(self, chunk_groups, max_chunks):
+        """
+        Run the model over consecutive chunks and stitch the predictions
         
-        # Concatenate all predictions
-        final_predictions = {}
-        for key in all_predictions:
-            if all_predictions[key]:
-                final_predictions[key] = np.concatenate(all_predictions[key], axis=1)
-            else:
-                # Fallback for very short audio
-                chunk_input = np.pad(audio_data, (0, chunk_size - len(audio_data))).reshape(1, chunk_size, 1).astype(np.float32)
-                prediction = self.model.predict(chunk_input)
-                final_predictions[key] = prediction[key]
+        Args:
+            chunk_groups (iterable): Arrays of consecutive chunks, each of
+                                     shape (chunks, CHUNK_SIZE)
+            max_chunks (int): Upper bound on the total number of chunks
+            
+        Returns:
+            dict: Predictions of shape (1, max_chunks * frames, bins); frames
+                  after the processed chunks are left unset and are trimmed
+                  by the caller along with those of the tail padding
+        """
+        all_predictions = {}
+        n_done = 0
         
-        return final_predictions
+        for chunks in chunk_groups:
+            # One contiguous copy of the (overlapping) chunks per group;
+            # every batch is then a contiguous view into it
+            chunks = np.ascontiguousarray(chunks, dtype=np.float32)
+            
+            # Process chunks in batches of shape (batch, time, channels)
+            for start in range(0, len(chunks), self.batch_size):
+                batch = chunks[start:start + self.batch_size, :, np.newaxis]
+                
+                # Get prediction
+                prediction = self._run_batch(batch)
+                
+                # Store predictions without the overlapping frames; what is left
+                # of consecutive chunks follows each other in time
+                for key, value in prediction.items():
+                    cropped = value[:, N_CROP_FRAMES:-N_CROP_FRAMES]
+                    n_chunk_frames, n_bins = cropped.shape[1:]
+                    
+                    if key not in all_predictions:
+                        # The first batch shows the frames per chunk, so the
+                        # whole output can be allocated once
+                        all_predictions[key] = np.empty((1, max_chunks * n_chunk_frames, n_bins), dtype=np.float32)
+                    
+                    all_predictions[key][0, n_done * n_chunk_frames:(n_done + len(batch)) * n_chunk_frames] = \
+                        cropped.reshape(-1, n_bins)
+                
+                n_done += len(batch)
+        
+        return all_predictions
     
     def _predictions_to_midi(self, predictions, onset_threshold=0.5, frame_threshold=0.3):
         """
@@ -151,84 +591,57 @@ class MusicTranscriber:
         Returns:
             tuple: (midi_data, note_events)
         """
-        from basic_pitch.constants import AUDIO_SAMPLE_RATE, ANNOTATIONS_FPS
-        
         # Extract predictions
         note_predictions = predictions['note'][0]  # Remove batch dimension
         onset_predictions = predictions['onset'][0]
         
-        # Apply thresholds
-        note_activations = note_predictions > frame_threshold
-        onset_activations = onset_predictions > onset_threshold
-        
         # Create MIDI
         midi_data = pretty_midi.PrettyMIDI()
         instrument = pretty_midi.Instrument(program=0)  # Piano
         
-        # Convert to note events
-        note_events = []
-        
         # Time resolution
         time_per_frame = 1.0 / ANNOTATIONS_FPS  # Basic Pitch uses ~86.13 FPS
         
-        # Find notes
-        for pitch_idx in range(note_activations.shape[1]):  # 88 piano keys
-            # Find note segments
-            note_active = note_activations[:, pitch_idx]
-            onset_active = onset_activations[:, pitch_idx]
-            
-            # Find note starts and ends
-            note_starts = []
-            note_ends = []
-            
-            in_note = False
-            note_start = 0
-            
-            for frame_idx in range(len(note_active)):
-                if not in_note and (onset_active[frame_idx] or note_active[frame_idx]):
-                    # Start of note
-                    in_note = True
-                    note_start = frame_idx
-                elif in_note and not note_active[frame_idx]:
-                    # End of note
-                    in_note = False
-                    note_starts.append(note_start)
-                    note_ends.append(frame_idx)
-            
-            # Handle note that extends to end
-            if in_note:
-                note_starts.append(note_start)
-                note_ends.append(len(note_active) - 1)
-            
-            # Create MIDI notes
-            for start_frame, end_frame in zip(note_starts, note_ends):
-                start_time = start_frame * time_per_frame
-                end_time = end_frame * time_per_frame
-                
-                # Convert pitch index to MIDI note number (A0 = 21)
-                midi_note = pitch_idx + 21
-                
-                # Minimum note length
-                if end_time - start_time >= 0.05:  # 50ms minimum
-                    note = pretty_midi.Note(
-                        velocity=80,
-                        pitch=midi_note,
-                        start=start_time,
-                        end=end_time
-                    )
-                    instrument.notes.append(note)
-                    
-                    note_events.append({
-                        'start_time': start_time,
-                        'end_time': end_time,
-                        'pitch': midi_note,
-                        'velocity': 80
-                    })
+        kernel = _compiled_note_kernel()
+        if kernel is not None:
+            # Thresholds, edge detection and the length filter in one pass
+            # over the predictions, without intermediate masks
+            pitch_indices, start_times, end_times = kernel(
+                note_predictions, onset_predictions, frame_threshold, onset_threshold,
+                time_per_frame, MIN_NOTE_SECONDS
+            )
+            
+            # The kernel emits notes as they end; order them by pitch, then start
+            order = np.lexsort((start_times, pitch_indices))
+            pitch_indices, start_times, end_times = pitch_indices[order], start_times[order], end_times[order]
+        else:
+            pitch_indices, start_times, end_times = _note_segments_numpy(
+                note_predictions, onset_predictions, frame_threshold, onset_threshold,
+                time_per_frame, MIN_NOTE_SECONDS
+            )
+        
+        # Convert pitch index to MIDI note number (A0 = 21)
+        segments = list(zip(
+            (pitch_indices + 21).tolist(),
+            start_times.tolist(),
+            end_times.tolist()
+        ))
+        
+        # Create MIDI notes and note events
+        instrument.notes = [
+            pretty_midi.Note(velocity=80, pitch=pitch, start=start, end=end)
+            for pitch, start, end in segments
+        ]
+        note_events = [
+            {'start_time': start, 'end_time': end, 'pitch': pitch, 'velocity': 80}
+            for pitch, start, end in segments
+        ]
         
         midi_data.instruments.append(instrument)
         return midi_data, note_events
     
-    def transcribe_audio_to_midi(self, audio_path, output_path=None, onset_threshold=0.5, frame_threshold=0.3):
+    def transcribe_audio_to_midi(self, audio_path, output_path=None, onset_threshold=0.5, frame_threshold=0.3,
+                                 audio_data=None):
         """
         Transcribe audio to MIDI using Basic Pitch ONNX model
         
@@ -237,6 +650,8 @@ class MusicTranscriber:
             output_path (str, optional): Path for the output MIDI file
             onset_threshold (float): Threshold for note onset detection (0.0-1.0)
             frame_threshold (float): Threshold for note frame detection (0.0-1.0)
+            audio_data (np.ndarray, optional): Samples of audio_path already
+                                               returned by load_audio
             
         Returns:
             str: Path to the generated MIDI file
@@ -252,67 +667,128 @@ class MusicTranscriber:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            print(f"Starting transcription of: {audio_path}")
-            print(f"Using onset threshold: {onset_threshold}")
-            print(f"Using frame threshold: {frame_threshold}")
-            
-            # Load audio
-            audio_data, sr = self.load_audio(audio_path)
+            log.info("Starting transcription of: %s\nUsing onset threshold: %s\nUsing frame threshold: %s",
+                     audio_path, onset_threshold, frame_threshold)
             
             # Perform transcription using ONNX model
-            print("Running Basic Pitch transcription with ONNX model...")
-            predictions = self._predict_with_onnx_model(audio_data)
+            log.info("Running Basic Pitch transcription with ONNX model...")
+            if audio_data is not None:
+                predictions = self._predict_with_onnx_model(audio_data)
+            elif Path(audio_path).suffix.lower() in ('.wav', '.flac'):
+                # Stream the file instead of loading it whole
+                predictions = self._predict_streaming(audio_path)
+            else:
+                audio_data, sr = self.load_audio(audio_path)
+                predictions = self._predict_with_onnx_model(audio_data)
             
             # Convert predictions to MIDI
-            print("Converting predictions to MIDI...")
+            log.info("Converting predictions to MIDI...")
             midi_data, note_events = self._predictions_to_midi(
                 predictions, onset_threshold, frame_threshold
             )
             
             # Save MIDI file
-            print(f"Saving MIDI to: {output_path}")
+            log.info("Saving MIDI to: %s", output_path)
             midi_data.write(output_path)
             
             # Get transcription statistics
             num_notes = len(note_events)
             duration = midi_data.get_end_time()
             
-            print(f"✓ Transcription completed!")
-            print(f"  - Output file: {output_path}")
-            print(f"  - Number of notes detected: {num_notes}")
-            print(f"  - MIDI duration: {duration:.2f} seconds")
+            log.info("✓ Transcription completed!\n  - Output file: %s\n"
+                     "  - Number of notes detected: %d\n  - MIDI duration: %.2f seconds",
+                     output_path, num_notes, duration)
             
             return output_path
             
         except Exception as e:
-            print(f"✗ Transcription failed: {str(e)}")
+            log.error("✗ Transcription failed: %s", e)
             raise
     
-    def analyze_audio_features(self, audio_path):
+    def transcribe_many(self, audio_paths, output_dir, workers=None, onset_threshold=0.5, frame_threshold=0.3):
+        """
+        Transcribe several audio files to MIDI in parallel worker processes
+        
+        Each worker loads its own ONNX session once and then transcribes the
+        files it is given.
+        
+        Args:
+            audio_paths (list): Paths to the input audio files
+            output_dir (str): Directory for the MIDI files, named after the inputs
+            workers (int, optional): Number of worker processes. Defaults to
+                                     min(number of files, CPU count)
+            onset_threshold (float): Threshold for note onset detection (0.0-1.0)
+            frame_threshold (float): Threshold for note frame detection (0.0-1.0)
+            
+        Returns:
+            list: MIDI file paths in input order; None for files that failed
+        """
+        
+        if workers is None:
+            workers = max(1, min(len(audio_paths), os.cpu_count() or 1))
+        
+        output_dir = Path(output_dir)
+        output_paths = [str(output_dir / f"{Path(audio_path).stem}.mid") for audio_path in audio_paths]
+        results = [None] * len(audio_paths)
+        
+        # Spawned, not forked: this process may already run ONNX Runtime or
+        # TensorFlow threads, which a forked child would inherit half-alive
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(self.batch_size, self.quantized)) as executor:
+            futures = {
+                executor.submit(_worker_transcribe, audio_path, output_path,
+                                onset_threshold, frame_threshold): i
+                for i, (audio_path, output_path) in enumerate(zip(audio_paths, output_paths))
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    log.error("✗ Transcription failed for %s: %s", audio_paths[i], e)
+        
+        return results
+    
+    def analyze_audio_features(self, audio_path, audio_data=None):
         """
         Analyze audio features for better transcription understanding
         
         Args:
             audio_path (str): Path to the audio file
+            audio_data (np.ndarray, optional): Samples of audio_path already
+                                               returned by load_audio
             
         Returns:
             dict: Audio analysis results
         """
         
         try:
-            # Load audio
-            audio_data, sr = self.load_audio(audio_path)
+            # Load audio unless the caller already has
+            if audio_data is None:
+                audio_data, sr = self.load_audio(audio_path)
+            else:
+                sr = self.sample_rate
             
             # Extract features
             features = {}
             
+            # One STFT (n_fft=2048, hop_length=512, librosa's defaults) and
+            # mel spectrogram shared by all spectral features below, instead
+            # of each of them computing its own
+            S = np.abs(librosa.stft(audio_data, n_fft=2048, hop_length=512))
+            power = S ** 2
+            log_mel = librosa.power_to_db(librosa.feature.melspectrogram(S=power, sr=sr))
+            
             # Tempo estimation
-            tempo, beats = librosa.beat.beat_track(y=audio_data, sr=sr)
+            onset_envelope = librosa.onset.onset_strength(S=log_mel, sr=sr)
+            tempo, beats = librosa.beat.beat_track(onset_envelope=onset_envelope, sr=sr)
             features['tempo'] = float(tempo)
             features['num_beats'] = len(beats)
             
             # Spectral features
-            spectral_centroids = librosa.feature.spectral_centroid(y=audio_data, sr=sr)[0]
+            spectral_centroids = librosa.feature.spectral_centroid(S=S, sr=sr)[0]
             features['spectral_centroid_mean'] = float(np.mean(spectral_centroids))
             features['spectral_centroid_std'] = float(np.std(spectral_centroids))
             
@@ -320,18 +796,16 @@ class MusicTranscriber:
             zcr = librosa.feature.zero_crossing_rate(audio_data)[0]
             features['zero_crossing_rate_mean'] = float(np.mean(zcr))
             
-            # RMS energy
-            rms = librosa.feature.rms(y=audio_data)[0]
+            # RMS energy (from the windowed spectrum)
+            rms = librosa.feature.rms(S=S)[0]
             features['rms_energy_mean'] = float(np.mean(rms))
             features['rms_energy_std'] = float(np.std(rms))
             
-            print(f"Audio analysis completed for: {audio_path}")
-            print(f"Estimated tempo: {features['tempo']:.1f} BPM")
-            print(f"Number of beats: {features['num_beats']}")
-            print("Audio analysis:")
-            print(f"  - Estimated tempo: {features['tempo']:.1f} BPM")
-            print(f"  - Spectral centroid: {features['spectral_centroid_mean']:.1f} Hz")
-            print(f"  - RMS energy: {features['rms_energy_mean']:.4f}")
+            log.info("Audio analysis completed for: %s\nEstimated tempo: %.1f BPM\nNumber of beats: %d\n"
+                     "Audio analysis:\n  - Estimated tempo: %.1f BPM\n"
+                     "  - Spectral centroid: %.1f Hz\n  - RMS energy: %.4f",
+                     audio_path, features['tempo'], features['num_beats'], features['tempo'],
+                     features['spectral_centroid_mean'], features['rms_energy_mean'])
             
             return features
             
@@ -361,45 +835,122 @@ class MusicTranscriber:
             except:
                 initial_tempo = 120.0  # Default tempo
             
-            info = {
-                'duration': midi_data.get_end_time(),
-                'num_instruments': len(midi_data.instruments),
-                'total_notes': sum(len(instrument.notes) for instrument in midi_data.instruments),
-                'initial_tempo': initial_tempo
-            }
-            
-            # Get note range for each instrument
-            info['instruments'] = []
+            # Count notes and get the note range of each instrument in one pass
+            total_notes = 0
+            instruments = []
             for i, instrument in enumerate(midi_data.instruments):
-                if len(instrument.notes) > 0:
-                    pitches = [note.pitch for note in instrument.notes]
-                    inst_info = {
+                num_notes = len(instrument.notes)
+                total_notes += num_notes
+                if num_notes > 0:
+                    pitches = np.fromiter((note.pitch for note in instrument.notes),
+                                          dtype=np.int16, count=num_notes)
+                    low, high = int(pitches.min()), int(pitches.max())
+                    instruments.append({
                         'index': i,
                         'name': instrument.name,
                         'program': instrument.program,
                         'is_drum': instrument.is_drum,
-                        'num_notes': len(instrument.notes),
-                        'pitch_range': [min(pitches), max(pitches)],
-                        'note_range': [pretty_midi.note_number_to_name(min(pitches)),
-                                     pretty_midi.note_number_to_name(max(pitches))]
-                    }
-                    info['instruments'].append(inst_info)
+                        'num_notes': num_notes,
+                        'pitch_range': [low, high],
+                        'note_range': [pretty_midi.note_number_to_name(low),
+                                     pretty_midi.note_number_to_name(high)]
+                    })
             
-            return info
+            return {
+                'duration': midi_data.get_end_time(),
+                'num_instruments': len(midi_data.instruments),
+                'total_notes': total_notes,
+                'initial_tempo': initial_tempo,
+                'instruments': instruments
+            }
             
         except Exception as e:
             raise Exception(f"Failed to analyze MIDI file: {str(e)}")
 
 
+# Transcriber of a transcribe_many worker process, created by _init_worker
+_worker_transcriber = None
+
+
+def _init_worker(batch_size, quantized):
+    """
+    Create the transcriber of a transcribe_many worker process
+    
+    Args:
+        batch_size (int): Batch size for the worker's transcriber
+        quantized (bool): Whether the worker uses the int8 model on CPU
+    """
+    global _worker_transcriber
+    # Never reuse a session from the parent, however the worker was started
+    _reset_sessions()
+    _worker_transcriber = MusicTranscriber(batch_size, quantized)
+
+
+def _worker_transcribe(audio_path, output_path, onset_threshold, frame_threshold):
+    """
+    Transcribe one file in a transcribe_many worker process
+    
+    Args:
+        audio_path (str): Path to the input audio file
+        output_path (str): Path for the output MIDI file
+        onset_threshold (float): Threshold for note onset detection (0.0-1.0)
+        frame_threshold (float): Threshold for note frame detection (0.0-1.0)
+        
+    Returns:
+        str: Path to the generated MIDI file
+    """
+    return _worker_transcriber.transcribe_audio_to_midi(
+        audio_path, output_path, onset_threshold, frame_threshold
+    )
+
+
+def main_serve(onset_threshold=0.5, frame_threshold=0.3):
+    """
+    Transcribe the audio files named on stdin, one path per line
+    
+    The model is loaded once for all files. Each MIDI file is written next
+    to its audio file, and a result line is printed per file. Runs until
+    stdin is closed.
+    
+    Args:
+        onset_threshold (float): Threshold for note onset detection (0.0-1.0)
+        frame_threshold (float): Threshold for note frame detection (0.0-1.0)
+    """
+    transcriber = MusicTranscriber()
+    
+    for line in sys.stdin:
+        audio_file = line.strip()
+        if not audio_file:
+            continue
+        
+        output_path = str(Path(audio_file).with_suffix('.mid'))
+        try:
+            transcriber.transcribe_audio_to_midi(audio_file, output_path, onset_threshold, frame_threshold)
+            print(f"✓ {output_path}", flush=True)
+        except Exception as e:
+            print(f"✗ {audio_file}: {str(e)}", flush=True)
+
+
 def main():
     """
     Command-line interface for the music transcriber
     """
     if len(sys.argv) < 2:
         print("Usage: python3 music_transcriber_fixed.py <audio_file> [output_file] [onset_threshold] [frame_threshold]")
+        print("       python3 music_transcriber_fixed.py --serve [onset_threshold] [frame_threshold] < paths.txt")
         print("Example: python3 music_transcriber_fixed.py audio.wav output.mid 0.5 0.3")
         sys.exit(1)
     
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
+    if sys.argv[1] == '--serve':
+        # Keep one model loaded and transcribe paths read from stdin
+        main_serve(
+            float(sys.argv[2]) if len(sys.argv) > 2 else 0.5,
+            float(sys.argv[3]) if len(sys.argv) > 3 else 0.3
+        )
+        return
+    
     audio_file = sys.argv[1]
     output_file = sys.argv[2] if len(sys.argv) > 2 else None
     onset_threshold = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
@@ -408,9 +959,12 @@ def main():
     transcriber = MusicTranscriber()
     
     try:
+        # Decode once; analysis and transcription share the samples
+        audio_data, _ = transcriber.load_audio(audio_file)
+        
         # Analyze audio features first
         print("Analyzing audio features...")
-        features = transcriber.analyze_audio_features(audio_file)
+        features = transcriber.analyze_audio_features(audio_file, audio_data)
         print()
         
         # Perform transcription
@@ -418,7 +972,8 @@ def main():
             audio_file, 
             output_file, 
             onset_threshold, 
-            frame_threshold
+            frame_threshold,
+            audio_data=audio_data
         )
         
         print()
@@ -11,10 +11,26 @@ Version: 1.0.0
 
 import os
 import sys
+import shutil
+import json
+import hashlib
+import tempfile
 import argparse
 from pathlib import Path
 import subprocess
+import signal
 import glob
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# Concurrent MuseScore jobs in a batch; each process takes a few hundred MB
+DEFAULT_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Input extensions MuseScore reads as MusicXML (.mxl is compressed MusicXML)
+MUSICXML_EXTENSIONS = {'.musicxml', '.xml', '.mxl'}
+
+# Tail of MuseScore's stderr kept for error messages
+MAX_STDERR_BYTES = 4096
 
 
 class MusicXMLToPDFConverter:
@@ -22,8 +38,195 @@ class MusicXMLToPDFConverter:
     Standalone converter for MusicXML files to PDF format
     """
     
-    def __init__(self):
+    def __init__(self, display=None, skip_up_to_date=False, verbose=False):
+        """
+        Args:
+            display (str, optional): X display MuseScore renders on (e.g. ':99').
+                Without one, each MuseScore run gets its own xvfb-run server
+                unless the converter is used as a context manager.
+            skip_up_to_date (bool): Keep outputs that are newer than their input
+                instead of converting again
+            verbose (bool): Print per-file progress details
+        """
         self.temp_files = []
+        self.skip_up_to_date = skip_up_to_date
+        self.verbose = verbose
+        
+        # MuseScore command, found by the first _check_musescore call
+        self.musescore_cmd = None
+        
+        self.display = display
+        self.xvfb_process = None
+    
+    def __enter__(self):
+        self.start_display()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        self.close()
+    
+    def start_display(self):
+        """
+        Start one Xvfb server that all conversions of this converter share
+        
+        Falls back to xvfb-run per conversion if Xvfb cannot be started.
+        
+        Returns:
+            bool: True if a display is available, False otherwise
+        """
+        if self.display is not None:
+            return True
+        
+        xvfb = shutil.which('Xvfb')
+        if xvfb is None:
+            return False
+        
+        # Xvfb picks a free display number and writes it to this pipe
+        read_fd, write_fd = os.pipe()
+        try:
+            self.xvfb_process = subprocess.Popen(
+                [xvfb, '-displayfd', str(write_fd), '-screen', '0', '1024x768x24',
+                 '-nolisten', 'tcp'],
+                pass_fds=(write_fd,),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError:
+            os.close(read_fd)
+            return False
+        finally:
+            os.close(write_fd)
+        
+        with os.fdopen(read_fd) as display_pipe:
+            display_number = display_pipe.readline().strip()
+        
+        if not display_number:
+            self.close()
+            return False
+        
+        self.display = f":{display_number}"
+        return True
+    
+    def close(self):
+        """
+        Stop the Xvfb server started by start_display, if any
+        """
+        xvfb_process = getattr(self, 'xvfb_process', None)
+        if xvfb_process is None:
+            return
+        
+        xvfb_process.terminate()
+        try:
+            xvfb_process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            xvfb_process.kill()
+            xvfb_process.wait()
+        self.xvfb_process = None
+        self.display = None
+    
+    def _log(self, message):
+        """
+        Print a progress detail, only in verbose mode
+        
+        Args:
+            message (str): Message to print
+        """
+        if self.verbose:
+            print(message)
+    
+    def _is_up_to_date(self, musicxml_path, output_path):
+        """
+        Check whether an output is newer than its MusicXML input
+        
+        Args:
+            musicxml_path (str): Path to the input MusicXML file
+            output_path (str): Path of the output file
+            
+        Returns:
+            bool: True if the conversion can be skipped, False otherwise
+        """
+        if not self.skip_up_to_date:
+            return False
+        
+        try:
+            return os.stat(output_path).st_mtime >= os.stat(musicxml_path).st_mtime
+        except FileNotFoundError:
+            return False
+    
+    def _stop_process_group(self, process):
+        """
+        Terminate a process and its session, killing it if it does not exit
+        
+        Args:
+            process (subprocess.Popen): Process started with start_new_session
+        """
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                process.communicate(timeout=2)
+                return
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.communicate()
+    
+    def _run_musescore(self, args, timeout, output_paths=(), remove_on_error=True):
+        """
+        Run MuseScore with the given arguments on a virtual display
+        
+        Outputs of a failed run are removed, so a partly written file is never
+        mistaken for an up-to-date one later.
+        
+        Args:
+            args (list): MuseScore command-line arguments
+            timeout (int): Timeout in seconds
+            output_paths (sequence): Files this run writes
+            remove_on_error (bool): Remove output_paths on any error exit; if
+                False, only when MuseScore timed out or was killed (a job
+                exits with an error when any one of its files fails)
+        
+        Returns:
+            subprocess.CompletedProcess: The finished MuseScore run, with the
+                tail of stderr as text if it failed
+        """
+        if self.display is not None:
+            cmd = [self.musescore_cmd] + args
+            env = dict(os.environ, DISPLAY=self.display)
+        else:
+            # Use xvfb-run to provide virtual display for MuseScore
+            cmd = ['xvfb-run', '-a', self.musescore_cmd] + args
+            env = None
+        
+        # MuseScore's stdout is never used; stderr is only shown on failure.
+        # Its own session lets a timeout stop xvfb-run's children as well.
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            env=env,
+            start_new_session=True
+        )
+        try:
+            _, stderr = process.communicate(timeout=timeout)
+        except BaseException:
+            # Timed out or interrupted: whatever was written may be partial
+            self._stop_process_group(process)
+            self._remove_outputs(output_paths)
+            raise
+        
+        if process.returncode < 0 or (process.returncode != 0 and remove_on_error):
+            self._remove_outputs(output_paths)
+        
+        result = subprocess.CompletedProcess(cmd, process.returncode, None, stderr)
+        if result.returncode != 0:
+            result.stderr = result.stderr[-MAX_STDERR_BYTES:].decode(errors='replace')
+        else:
+            result.stderr = ''
+        return result
     
     def convert_to_pdf(self, musicxml_path, pdf_path=None, use_musescore=True):
         """
@@ -43,17 +246,20 @@ class MusicXMLToPDFConverter:
         
         # Generate output path if not provided
         if pdf_path is None:
-            musicxml_stem = Path(musicxml_path).stem
-            pdf_path = f"{musicxml_stem}_score.pdf"
+            pdf_path = f"{Path(musicxml_path).stem}_score.pdf"
+        
+        if self._is_up_to_date(musicxml_path, pdf_path):
+            print(f"✓ PDF is up to date: {pdf_path}")
+            return pdf_path
         
         # Ensure output directory exists
         output_dir = Path(pdf_path).parent
         output_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            print(f"Converting MusicXML to PDF...")
-            print(f"  - Input: {musicxml_path}")
-            print(f"  - Output: {pdf_path}")
+            self._log(f"Converting MusicXML to PDF...")
+            self._log(f"  - Input: {musicxml_path}")
+            self._log(f"  - Output: {pdf_path}")
             
             if use_musescore:
                 success = self._convert_with_musescore(musicxml_path, pdf_path)
@@ -83,30 +289,21 @@ class MusicXMLToPDFConverter:
         """
         
         try:
-            print("Using MuseScore for PDF conversion...")
+            self._log("Using MuseScore for PDF conversion...")
             
             # Check if MuseScore is available
             if not self._check_musescore():
                 raise Exception("MuseScore not found. Please install MuseScore 3.")
             
-            # Use xvfb-run to provide virtual display for MuseScore
-            cmd = [
-                'xvfb-run', '-a',
-                'musescore3',
-                '-o', pdf_path,
-                musicxml_path
-            ]
-            
             # Run MuseScore conversion
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120  # 2 minute timeout
+            result = self._run_musescore(
+                ['-o', pdf_path, musicxml_path],
+                timeout=120,  # 2 minute timeout
+                output_paths=[pdf_path]
             )
             
             if result.returncode == 0 and os.path.exists(pdf_path):
-                print("✓ MuseScore conversion successful")
+                self._log("✓ MuseScore conversion successful")
                 return True
             else:
                 print(f"✗ MuseScore conversion failed:")
@@ -126,19 +323,21 @@ class MusicXMLToPDFConverter:
         """
         Check if MuseScore is available (tries musescore3, musescore, musescore4, mscore)
         
+        The command found is kept, so only the first call searches for it.
+        
         Returns:
             bool: True if MuseScore is available, False otherwise
         """
-        self.musescore_cmd = None
+        if self.musescore_cmd is not None:
+            return True
+        
         candidates = ['musescore3', 'musescore', 'musescore4']
         for cmd in candidates:
-            try:
-                result = subprocess.run(['which', cmd], capture_output=True, text=True)
-                if result.returncode == 0:
-                    self.musescore_cmd = cmd
-                    return True
-            except Exception:
-                continue
+            # Searches PATH in-process, without running `which`
+            path = shutil.which(cmd)
+            if path:
+                self.musescore_cmd = path
+                return True
         return False
     
     def convert_to_png(self, musicxml_path, png_path=None, resolution=300):
@@ -159,62 +358,40 @@ class MusicXMLToPDFConverter:
         
         # Generate output path if not provided
         if png_path is None:
-            musicxml_stem = Path(musicxml_path).stem
-            png_path = f"{musicxml_stem}_score.png"
+            png_path = f"{Path(musicxml_path).stem}_score.png"
+        
+        if self._is_up_to_date(musicxml_path, png_path):
+            print(f"✓ PNG is up to date: {png_path}")
+            return png_path
         
         # Ensure output directory exists
         output_dir = Path(png_path).parent
         output_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            print(f"Converting MusicXML to PNG...")
-            print(f"  - Input: {musicxml_path}")
-            print(f"  - Output: {png_path}")
-            print(f"  - Resolution: {resolution} DPI")
+            self._log(f"Converting MusicXML to PNG...")
+            self._log(f"  - Input: {musicxml_path}")
+            self._log(f"  - Output: {png_path}")
+            self._log(f"  - Resolution: {resolution} DPI")
             
             # Check if MuseScore is available
             if not self._check_musescore():
                 raise Exception("MuseScore not found. Please install MuseScore 3.")
             
             # Use MuseScore to convert to PNG
-            cmd = [
-                'xvfb-run', '-a',
-                getattr(self, 'musescore_cmd', 'mscore'),
-                '-r', str(resolution),
-                '-o', png_path,
-                musicxml_path
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120
+            result = self._run_musescore(
+                ['-r', str(resolution), '-o', png_path, musicxml_path],
+                timeout=120,
+                output_paths=[png_path]
             )
             
             if result.returncode == 0:
-                # MuseScore adds page numbers to PNG files (e.g., file-1.png)
-                # Check for the actual generated file
-                png_stem = Path(png_path).stem
-                png_dir = Path(png_path).parent
-                
-                # Look for files with page numbers
-                generated_files = list(png_dir.glob(f"{png_stem}-*.png"))
+                num_pages = self._collect_png_pages(png_path)
                 
-                if generated_files:
-                    # If multiple pages, return the first one or rename it
-                    actual_file = generated_files[0]
-                    if str(actual_file) != png_path:
-                        # Rename the first page to the requested filename
-                        import shutil
-                        shutil.move(str(actual_file), png_path)
-                    
-                    print(f"✓ PNG generated successfully: {png_path}")
-                    if len(generated_files) > 1:
-                        print(f"  Note: {len(generated_files)} pages generated, using first page")
-                    return png_path
-                elif os.path.exists(png_path):
+                if num_pages:
                     print(f"✓ PNG generated successfully: {png_path}")
+                    if num_pages > 1:
+                        self._log(f"  Note: {num_pages} pages generated, using first page")
                     return png_path
                 else:
                     print(f"✗ PNG conversion failed: No output file found")
@@ -232,62 +409,333 @@ class MusicXMLToPDFConverter:
             print(f"✗ PNG conversion failed: {str(e)}")
             raise
     
-    def batch_convert(self, input_files, output_dir=None, output_format='pdf', resolution=300):
+    def _remove_outputs(self, output_paths):
+        """
+        Remove output files, including the page files of PNG outputs
+        
+        Args:
+            output_paths (sequence): Output file paths
+        """
+        for output_path in output_paths:
+            output_file = Path(output_path)
+            output_file.unlink(missing_ok=True)
+            if output_file.suffix == '.png' and output_file.parent.is_dir():
+                for page_path in self._png_pages(output_file).values():
+                    os.remove(page_path)
+    
+    def _png_pages(self, png_file):
+        """
+        Find the page files MuseScore rendered for a PNG output
+        
+        Args:
+            png_file (Path): Requested PNG file path
+            
+        Returns:
+            dict: Page file paths by page number
+        """
+        prefix = f"{png_file.stem}-"
+        
+        # One pass over the directory with plain string checks
+        pages = {}
+        with os.scandir(png_file.parent) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(prefix) and name.endswith('.png'):
+                    page = name[len(prefix):-len('.png')]
+                    if page.isdigit():
+                        pages[int(page)] = entry.path
+        return pages
+    
+    def _collect_png_pages(self, png_path):
+        """
+        Move the first page MuseScore rendered for png_path onto png_path
+        
+        MuseScore adds page numbers to PNG files (e.g., file-1.png).
+        
+        Args:
+            png_path (str or Path): Requested PNG file path
+            
+        Returns:
+            int: Number of pages found (0 if no output was generated)
+        """
+        png_file = Path(png_path)
+        pages = self._png_pages(png_file)
+        
+        if pages:
+            # Rename the first page to the requested filename; both are in
+            # the same directory, so this is always a plain rename
+            os.replace(pages[min(pages)], png_file)
+            return len(pages)
+        
+        return 1 if png_file.exists() else 0
+    
+    def batch_convert_musescore_job(self, input_files, output_paths, output_format='pdf',
+                                    resolution=300):
+        """
+        Convert several MusicXML files in a single MuseScore process
+        
+        MuseScore's job mode (-j) reads a JSON list of input/output pairs, so
+        MuseScore and the virtual display start once for the whole list
+        instead of once per file.
+        
+        Args:
+            input_files (list): List of MusicXML file paths
+            output_paths (list): Output file path for each input file
+            output_format (str): Output format ('pdf' or 'png')
+            resolution (int): DPI resolution for PNG output
+            
+        Returns:
+            list: List of conversion results, in input order
+        """
+        
+        def failed(error):
+            return [{'file': input_file, 'output': None, 'success': False, 'error': error}
+                    for input_file in input_files]
+        
+        if not self._check_musescore():
+            return failed("MuseScore not found. Please install MuseScore 3.")
+        
+        job = []
+        output_dirs = set()
+        for input_file, output_path in zip(input_files, output_paths):
+            output_file = Path(output_path)
+            # A batch usually writes to one directory; create each one once
+            if output_file.parent not in output_dirs:
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+                output_dirs.add(output_file.parent)
+            # Success is judged by the output existing, so drop stale ones
+            output_file.unlink(missing_ok=True)
+            job.append({'in': os.path.abspath(input_file), 'out': str(output_file.absolute())})
+        
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as job_file:
+            json.dump(job, job_file)
+        
+        try:
+            # Same 2 minute budget per file as a single conversion
+            result = self._run_musescore(
+                ['-r', str(resolution), '-j', job_file.name],
+                timeout=120 * len(input_files),
+                output_paths=output_paths,
+                remove_on_error=False
+            )
+        except subprocess.TimeoutExpired:
+            return failed("MuseScore job timed out")
+        finally:
+            os.remove(job_file.name)
+        
+        results = []
+        for input_file, output_path in zip(input_files, output_paths):
+            if output_format == 'png':
+                converted = self._collect_png_pages(output_path) > 0
+            else:
+                converted = os.path.exists(output_path)
+            
+            if converted:
+                results.append({'file': input_file, 'output': output_path, 'success': True})
+            else:
+                error = f"No output file found (MuseScore return code {result.returncode})"
+                if result.stderr:
+                    error += f": {result.stderr.strip()}"
+                results.append({'file': input_file, 'output': None, 'success': False, 'error': error})
+        
+        return results
+    
+    def _content_digest(self, path):
+        """
+        Hash the content of a file
+        
+        Args:
+            path (str): Path to the file
+            
+        Returns:
+            str: Hex digest, or None if the file cannot be read
+        """
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+    
+    def _link_output(self, input_file, source_result, output_path):
+        """
+        Reuse the output converted from an identical input file
+        
+        The output is hard-linked where possible and copied otherwise.
+        
+        Args:
+            input_file (str): Path to the duplicate MusicXML file
+            source_result (dict): Conversion result of the identical file
+            output_path (str): Output file path for the duplicate
+            
+        Returns:
+            dict: Conversion result for the duplicate
+        """
+        if not source_result['success']:
+            return {'file': input_file, 'output': None, 'success': False,
+                    'error': source_result['error']}
+        
+        source_path = source_result['output']
+        try:
+            if os.path.abspath(source_path) != os.path.abspath(output_path):
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                try:
+                    os.link(source_path, output_path)
+                except OSError:
+                    shutil.copyfile(source_path, output_path)
+        except OSError as e:
+            return {'file': input_file, 'output': None, 'success': False, 'error': str(e)}
+        
+        return {'file': input_file, 'output': output_path, 'success': True}
+    
+    def batch_convert(self, input_files, output_dir=None, output_format='pdf', resolution=300,
+                      workers=DEFAULT_WORKERS, output_paths=None):
         """
         Convert multiple MusicXML files
         
+        The files are split into one MuseScore job per worker, and up to
+        `workers` jobs run at the same time in worker processes. A single
+        job runs in this process.
+        
         Args:
             input_files (list): List of MusicXML file paths
             output_dir (str, optional): Output directory
             output_format (str): Output format ('pdf' or 'png')
             resolution (int): DPI resolution for PNG output
+            workers (int): Maximum number of concurrent MuseScore jobs
+            output_paths (list, optional): Output file path for each input file,
+                instead of naming outputs after the inputs in output_dir
             
         Returns:
-            list: List of conversion results
+            list: List of conversion results, in input order
         """
         
-        results = []
+        output_format = output_format.lower()
+        if output_format not in ('pdf', 'png'):
+            raise ValueError(f"Unsupported output format: {output_format}")
         
-        print(f"Batch converting {len(input_files)} MusicXML files to {output_format.upper()}...")
+        if output_paths is None:
+            output_dir_path = Path(output_dir or '.')
+            output_paths = [
+                str(output_dir_path / f"{Path(input_file).stem}_score.{output_format}")
+                for input_file in input_files
+            ]
+        else:
+            output_paths = [str(output_path) for output_path in output_paths]
+        results = [None] * len(input_files)
+        
+        # Outputs newer than their input are kept as they are
+        pending = []
+        for i, (input_file, output_path) in enumerate(zip(input_files, output_paths)):
+            if self._is_up_to_date(input_file, output_path):
+                results[i] = {'file': input_file, 'output': output_path, 'success': True,
+                              'skipped': True}
+            else:
+                pending.append(i)
+        
+        # Identical inputs render identically, so each content is converted once
+        converted_as = {}
+        duplicates = {}
+        for i in pending:
+            digest = self._content_digest(input_files[i])
+            if digest is None:
+                continue
+            if digest in converted_as:
+                duplicates[i] = converted_as[digest]
+            else:
+                converted_as[digest] = i
+        pending = [i for i in pending if i not in duplicates]
+        workers = max(1, min(workers, len(pending)))
+        
+        if len(input_files) == 1:
+            print(f"Converting MusicXML to {output_format.upper()}: {input_files[0]}")
+        else:
+            print(f"Batch converting {len(input_files)} MusicXML files to {output_format.upper()} "
+                  f"({workers} workers)...")
+        if len(pending) + len(duplicates) < len(input_files):
+            print(f"  - Up to date, skipped: {len(input_files) - len(pending) - len(duplicates)}")
+        if duplicates:
+            print(f"  - Duplicate inputs, copied: {len(duplicates)}")
         print("=" * 60)
         
-        for i, input_file in enumerate(input_files, 1):
-            print(f"\nProcessing file {i}/{len(input_files)}: {input_file}")
-            
-            try:
-                # Setup output path
-                if output_dir:
-                    output_dir_path = Path(output_dir)
-                    output_dir_path.mkdir(parents=True, exist_ok=True)
-                    output_path = output_dir_path / f"{Path(input_file).stem}_score.{output_format}"
-                else:
-                    output_path = None
-                
-                # Convert file
-                if output_format.lower() == 'pdf':
-                    result_path = self.convert_to_pdf(input_file, str(output_path) if output_path else None)
-                elif output_format.lower() == 'png':
-                    result_path = self.convert_to_png(input_file, str(output_path) if output_path else None, resolution)
+        # Every worker-th file, so large and small scores spread across jobs
+        jobs = [pending[w::workers] for w in range(workers)]
+        
+        def report(indices, job_results):
+            for i, result in zip(indices, job_results):
+                results[i] = result
+                if result['success']:
+                    self._log(f"✓ File {i + 1}/{len(input_files)} converted successfully: {result['file']}")
                 else:
-                    raise ValueError(f"Unsupported output format: {output_format}")
-                
-                results.append({'file': input_file, 'output': result_path, 'success': True})
-                print(f"✓ File {i} converted successfully")
-                
-            except Exception as e:
-                print(f"✗ File {i} conversion failed: {str(e)}")
-                results.append({'file': input_file, 'output': None, 'success': False, 'error': str(e)})
+                    print(f"✗ File {i + 1}/{len(input_files)} conversion failed: {result['error']}")
+        
+        if workers == 1 and pending:
+            report(jobs[0], self.batch_convert_musescore_job(
+                [input_files[i] for i in jobs[0]],
+                [output_paths[i] for i in jobs[0]],
+                output_format,
+                resolution
+            ))
+        elif workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(
+                        _convert_job,
+                        [input_files[i] for i in indices],
+                        [output_paths[i] for i in indices],
+                        output_format,
+                        resolution,
+                        self.display
+                    ): indices
+                    for indices in jobs
+                }
+                for future in as_completed(futures):
+                    indices = futures[future]
+                    try:
+                        job_results = future.result()
+                    except Exception as e:
+                        job_results = [{'file': input_files[i], 'output': None, 'success': False,
+                                        'error': str(e)} for i in indices]
+                    report(indices, job_results)
+        
+        for i, source in duplicates.items():
+            report([i], [self._link_output(input_files[i], results[source], output_paths[i])])
         
         # Summary
-        successful = sum(1 for r in results if r['success'])
-        print(f"\nBatch conversion summary:")
-        print(f"  - Total files: {len(input_files)}")
-        print(f"  - Successful: {successful}")
-        print(f"  - Failed: {len(input_files) - successful}")
+        if len(input_files) > 1:
+            successful = sum(1 for r in results if r['success'])
+            print(f"\nBatch conversion summary:")
+            print(f"  - Total files: {len(input_files)}")
+            print(f"  - Successful: {successful}")
+            print(f"  - Failed: {len(input_files) - successful}")
         
         return results
 
 
+# Converter of a batch_convert worker process, created on its first job
+_worker_converter = None
+
+
+def _convert_job(input_files, output_paths, output_format, resolution, display=None):
+    """
+    Run one MuseScore job of a batch in a batch_convert worker process
+    
+    Args:
+        input_files (list): MusicXML file paths of the job
+        output_paths (list): Output file path for each input file
+        output_format (str): Output format ('pdf' or 'png')
+        resolution (int): DPI resolution for PNG output
+        display (str, optional): X display of the parent converter to share
+        
+    Returns:
+        list: Conversion results, in input order
+    """
+    global _worker_converter
+    if _worker_converter is None:
+        _worker_converter = MusicXMLToPDFConverter(display)
+    return _worker_converter.batch_convert_musescore_job(
+        input_files, output_paths, output_format, resolution)
+
 def main():
     """
     Command-line interface for the MusicXML to PDF converter
@@ -326,81 +774,83 @@ Examples:
                        help='Resolution for PNG output (default: 300 DPI)')
     
     # Processing options
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                       help=f'Concurrent MuseScore jobs for batch input (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--force', action='store_true',
+                       help='Convert even if the output is newer than the input '
+                            '(by default such outputs are kept)')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='Verbose output')
     
     args = parser.parse_args()
     
-    # Expand glob patterns
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    
+    # Expand glob patterns and check inputs in a single pass
     input_files = []
     for pattern in args.input_files:
-        if '*' in pattern or '?' in pattern:
-            expanded = glob.glob(pattern)
-            if expanded:
-                input_files.extend(expanded)
-            else:
-                print(f"Warning: No files found matching pattern: {pattern}")
+        if any(c in pattern for c in '*?['):
+            # iglob only yields files that exist
+            expanded = glob.iglob(pattern)
+        elif os.path.exists(pattern):
+            expanded = [pattern]
         else:
-            input_files.append(pattern)
+            print(f"Error: Input file not found: {pattern}")
+            sys.exit(1)
+        
+        matched = False
+        for input_file in expanded:
+            matched = True
+            input_files.append(input_file)
+            
+            # Check if it's a MusicXML file
+            if os.path.splitext(input_file)[1].lower() not in MUSICXML_EXTENSIONS:
+                print(f"Warning: File may not be MusicXML: {input_file}")
+        
+        if not matched:
+            print(f"Warning: No files found matching pattern: {pattern}")
     
     if not input_files:
         print("Error: No input files specified")
         sys.exit(1)
     
-    # Check input files exist
-    for input_file in input_files:
-        if not os.path.exists(input_file):
-            print(f"Error: Input file not found: {input_file}")
-            sys.exit(1)
-        
-        # Check if it's a MusicXML file
-        if not input_file.lower().endswith(('.musicxml', '.xml')):
-            print(f"Warning: File may not be MusicXML: {input_file}")
-    
-    # Create converter
-    converter = MusicXMLToPDFConverter()
-    
-    try:
-        # Single file conversion
-        if len(input_files) == 1:
-            input_file = input_files[0]
-            
-            if args.format == 'pdf':
-                result = converter.convert_to_pdf(input_file, args.output)
-            else:  # png
-                result = converter.convert_to_png(input_file, args.output, args.resolution)
-            
-            print(f"\n✓ Conversion completed successfully!")
-            print(f"Output file: {result}")
-        
-        # Batch conversion
-        else:
-            # For batch conversion, output should be a directory
-            if args.output and not args.output.endswith('/'):
-                output_dir = args.output
+    # Create converter; one virtual display serves every conversion
+    with MusicXMLToPDFConverter(skip_up_to_date=not args.force, verbose=args.verbose) as converter:
+        try:
+            # A single input's -o names the output file rather than a directory
+            if (len(input_files) == 1 and args.output
+                    and not args.output.endswith('/') and not os.path.isdir(args.output)):
+                output_dir, output_paths = None, [args.output]
             else:
-                output_dir = args.output
+                output_dir, output_paths = args.output, None
             
+            # Single files go through the same path as batches, run in-process
             results = converter.batch_convert(
                 input_files,
                 output_dir,
                 args.format,
-                args.resolution
+                args.resolution,
+                workers=args.workers,
+                output_paths=output_paths
             )
             
             # Exit with error if any conversion failed
             if not all(r['success'] for r in results):
                 print(f"\nSome conversions failed. Check the output above for details.")
                 sys.exit(1)
+            elif len(results) == 1:
+                print(f"\n✓ Conversion completed successfully!")
+                print(f"Output file: {results[0]['output']}")
             else:
                 print(f"\n✓ All conversions completed successfully!")
-        
-    except KeyboardInterrupt:
-        print("\n\nConversion interrupted by user")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\nUnexpected error: {str(e)}")
-        sys.exit(1)
+            
+        except KeyboardInterrupt:
+            print("\n\nConversion interrupted by user")
+            sys.exit(1)
+        except Exception as e:
+            print(f"\nUnexpected error: {str(e)}")
+            sys.exit(1)
 
 
 if __name__ == "__main__":
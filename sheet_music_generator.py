@@ -6,6 +6,7 @@ This module handles converting MIDI files to visual sheet music notation
 using music21 and other music notation libraries.
 """
 
+import io
 import os
 import sys
 from pathlib import Path
@@ -71,6 +72,48 @@ class SheetMusicGenerator:
         except Exception as e:
             raise Exception(f"Failed to load MIDI file: {str(e)}")
     
+    def load_pretty_midi_to_music21(self, midi_data):
+        """
+        Convert in-memory MIDI data to a music21 stream without a MIDI file
+        
+        Args:
+            midi_data (pretty_midi.PrettyMIDI): The MIDI data
+            
+        Returns:
+            music21.stream.Stream: The loaded musical score
+        """
+        
+        try:
+            buffer = io.BytesIO()
+            midi_data.write(buffer)
+            
+            midi_file = music21_midi.MidiFile()
+            midi_file.readstr(buffer.getvalue())
+            score = midi_translate.midiFileToStream(midi_file)
+            
+            print(f"✓ MIDI data loaded successfully")
+            print(f"  - Duration: {score.duration.quarterLength} quarter notes")
+            print(f"  - Number of parts: {len(score.parts)}")
+            
+            return score
+            
+        except Exception as e:
+            raise Exception(f"Failed to load MIDI data: {str(e)}")
+    
+    def _load_score(self, midi_path):
+        """
+        Load a MIDI file path or in-memory MIDI data as a music21 stream
+        
+        Args:
+            midi_path (str or pretty_midi.PrettyMIDI): MIDI file or MIDI data
+            
+        Returns:
+            music21.stream.Stream: The loaded musical score
+        """
+        if isinstance(midi_path, pretty_midi.PrettyMIDI):
+            return self.load_pretty_midi_to_music21(midi_path)
+        return self.load_midi_to_music21(midi_path)
+    
     def analyze_musical_content(self, score):
         """
         Analyze the musical content of a score
@@ -199,7 +242,8 @@ class SheetMusicGenerator:
         Generate sheet music from a MIDI file
         
         Args:
-            midi_path (str): Path to the input MIDI file
+            midi_path (str or pretty_midi.PrettyMIDI): Path to the input MIDI
+                                                       file, or in-memory MIDI data
             output_path (str, optional): Path for the output file
             output_format (str): Output format ('png', 'pdf', 'svg', 'musicxml')
             title (str, optional): Title for the sheet music
@@ -211,7 +255,7 @@ class SheetMusicGenerator:
         
         # Generate output path if not provided
         if output_path is None:
-            midi_stem = Path(midi_path).stem
+            midi_stem = "transcription" if isinstance(midi_path, pretty_midi.PrettyMIDI) else Path(midi_path).stem
             output_path = f"{midi_stem}_sheet.{output_format}"
         
         # Ensure output directory exists
@@ -219,12 +263,13 @@ class SheetMusicGenerator:
         output_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            print(f"Generating sheet music from: {midi_path}")
+            if not isinstance(midi_path, pretty_midi.PrettyMIDI):
+                print(f"Generating sheet music from: {midi_path}")
             print(f"Output format: {output_format}")
             print(f"Output file: {output_path}")
             
             # Load MIDI file
-            score = self.load_midi_to_music21(midi_path)
+            score = self._load_score(midi_path)
             
             # Analyze musical content
             print("\nAnalyzing musical content...")
@@ -280,12 +325,28 @@ class SheetMusicGenerator:
             print(f"✗ Sheet music generation failed: {str(e)}")
             raise
     
+    def from_pretty_midi(self, midi_data, output_path, output_format='musicxml', title=None):
+        """
+        Generate sheet music from in-memory MIDI data
+        
+        Args:
+            midi_data (pretty_midi.PrettyMIDI): The MIDI data
+            output_path (str): Path for the output file
+            output_format (str): Output format ('png', 'pdf', 'svg', 'musicxml')
+            title (str, optional): Title for the sheet music
+            
+        Returns:
+            str: Path to the generated sheet music file
+        """
+        return self.generate_sheet_music(midi_data, output_path, output_format, title)
+    
     def create_simple_notation(self, midi_path, output_path=None):
         """
         Create a simplified notation focusing on melody
         
         Args:
-            midi_path (str): Path to the input MIDI file
+            midi_path (str or pretty_midi.PrettyMIDI): Path to the input MIDI
+                                                       file, or in-memory MIDI data
             output_path (str, optional): Path for the output file
             
         Returns:
@@ -293,14 +354,15 @@ class SheetMusicGenerator:
         """
         
         if output_path is None:
-            midi_stem = Path(midi_path).stem
+            midi_stem = "transcription" if isinstance(midi_path, pretty_midi.PrettyMIDI) else Path(midi_path).stem
             output_path = f"{midi_stem}_simple.musicxml"
         
         try:
-            print(f"Creating simple notation from: {midi_path}")
+            if not isinstance(midi_path, pretty_midi.PrettyMIDI):
+                print(f"Creating simple notation from: {midi_path}")
             
             # Load MIDI
-            score = self.load_midi_to_music21(midi_path)
+            score = self._load_score(midi_path)
             
             # Create a simplified version
             simple_score = stream.Score()
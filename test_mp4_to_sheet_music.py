@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the conversion pipeline's decode buffer handling
+"""
+
+import numpy as np
+
+from mp4_to_sheet_music import Float32ArenaPool, MP4ToSheetMusicConverter
+
+
+class _StubTranscriber:
+    """Transcriber that returns empty results without loading a model"""
+    
+    sample_rate = 22050
+    
+    def __init__(self, on_midi_info):
+        self.on_midi_info = on_midi_info
+    
+    def analyze_audio_features_array(self, audio_data, sr):
+        return {'tempo': 120.0, 'spectral_centroid_mean': 0.0, 'rms_energy_mean': 0.0}
+    
+    def transcribe_array(self, audio_data, sr, *args):
+        return object(), None
+    
+    def get_midi_info(self, midi):
+        self.on_midi_info()
+        return {'total_notes': 0, 'duration': 0.0, 'num_instruments': 0}
+
+
+class _FailingSheetGenerator:
+    """Sheet generator whose export always fails"""
+    
+    def generate_sheet_music(self, *args):
+        raise RuntimeError("sheet export failed")
+
+
+def test_failure_after_transcription_does_not_release_buffer_twice(tmp_path):
+    """A slot released after transcription must not be freed again on a later error"""
+    queued = {}
+    
+    class Converter(MP4ToSheetMusicConverter):
+        music_transcriber = _StubTranscriber(
+            # The decode-ahead thread takes the released slot for the next file
+            on_midi_info=lambda: queued.setdefault('audio', converter.buffer_pool.acquire(8))
+        )
+        sheet_generator = _FailingSheetGenerator()
+    
+    converter = Converter()
+    converter.buffer_pool = Float32ArenaPool(max_samples=8, num_slots=1)
+    
+    input_path = tmp_path / "song.wav"
+    input_path.write_bytes(b"")
+    decoded = converter.buffer_pool.acquire(8)
+    
+    results = converter.convert_to_sheet_music(
+        str(input_path), str(tmp_path / "out"), decoded_audio=decoded
+    )
+    
+    assert not results['success']
+    assert results['error'] == "sheet export failed"
+    
+    # The queued file still owns the only slot, so a new request gets its own array
+    queued['audio'][:] = 1.0
+    following = converter.buffer_pool.acquire(8)
+    following[:] = 2.0
+    assert not np.shares_memory(queued['audio'], following)
+    assert (queued['audio'] == 1.0).all()
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+User Cache Location for Music Sheet Generator
+
+Extracted audio tracks and quantized models are kept under one directory,
+set with the MSG_AUDIO_CACHE environment variable.
+"""
+
+import os
+from pathlib import Path
+
+
+# Root of everything the generator caches between runs
+CACHE_ROOT = Path(os.environ.get("MSG_AUDIO_CACHE", "~/.cache/music_sheet_gen")).expanduser()